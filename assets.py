@@ -0,0 +1,174 @@
+import io
+import os
+import time
+import pygame
+from settings import BW_AUTO, BW_FILES, BW_TRANSFORM
+
+# Image files, keyed by the name the sprites ask for
+IMAGE_FILES = {
+    "bg": "img/bg.png",
+    "spaceship": "img/spaceship.png",
+    "bullet": "img/bullet.png",
+    "alien_bullet": "img/alien_bullet.png",
+    "boss": "img/boss.png",
+}
+BW_IMAGE_FILES = {
+    "spaceship": "img/bw/spaceship_bw_cleaned_final.png",
+    "bullet": "img/bw/bullet_bw_cleaned_final.png",
+    "alien_bullet": "img/bw/alien_bullet_bw_cleaned_final.png",
+    "boss": "img/bw/boss_bw.png",
+}
+for num in range(1, 6):
+    IMAGE_FILES[f"alien{num}"] = f"img/alien{num}.png"
+    IMAGE_FILES[f"exp{num}"] = f"img/exp{num}.png"
+    BW_IMAGE_FILES[f"alien{num}"] = f"img/bw/alien{num}_bw_cleaned_final.png"
+    BW_IMAGE_FILES[f"exp{num}"] = f"img/bw/exp{num}_bw_cleaned_final.png"
+
+# Explosion frame sizes, indexed by the size passed to Explosion
+EXPLOSION_SIZES = {1: (20, 20), 2: (40, 40), 3: (160, 160)}
+
+# Sizes used by Aliens.make_special for "fast" and "tank" aliens
+SPECIAL_ALIEN_SIZES = [(40, 40), (60, 60)]
+
+# Shared surfaces handed out to every sprite
+images = {}
+bw_images = {}
+explosion_frames = {}
+bw_explosion_frames = {}
+scaled_images = {}
+masks = {}  # Surface -> collision mask, built once per unique surface
+
+# Load statistics
+load_times = {}
+load_total_time = 0.0
+decode_count = 0
+gameplay_decode_count = 0
+loaded = False
+bw_source = None  # BW_FILES or BW_TRANSFORM once loaded
+
+def _decode(path, alpha=True, data=None):
+    """Decode one image file, or its bytes if already read, converting it to the display format."""
+    global decode_count, gameplay_decode_count
+    start = time.perf_counter()
+    source = io.BytesIO(data) if data is not None else path
+    surface = pygame.image.load(source, path)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha() if alpha else surface.convert()
+    decode_count += 1
+    if loaded:
+        # Anything decoded after load_assets() is a frame spike during gameplay
+        gameplay_decode_count += 1
+    load_times[path] = time.perf_counter() - start
+    return surface
+
+
+def _bw_source(bw_mode):
+    """Where black and white images come from: img/bw with BW_FILES, grayscale copies otherwise.
+
+    BW_AUTO only uses the files when all of them exist.
+    """
+    if bw_mode == BW_AUTO:
+        have_files = all(os.path.exists(path) for path in BW_IMAGE_FILES.values())
+        bw_mode = BW_FILES if have_files else BW_TRANSFORM
+    return BW_FILES if bw_mode == BW_FILES else BW_TRANSFORM
+
+
+def read_files(bw_mode=BW_AUTO):
+    """Read every image file load_assets() will decode into memory; returns path -> bytes.
+
+    This is only file I/O, so unlike decoding it is safe to run off the main thread.
+    """
+    paths = list(IMAGE_FILES.values())
+    if _bw_source(bw_mode) == BW_FILES:
+        paths += BW_IMAGE_FILES.values()
+    data = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            data[path] = f.read()
+    return data
+
+
+def load_assets(bw_mode=BW_AUTO, data=None):
+    """Decode every image once and pre-build the scaled variants.
+
+    data (from read_files()) supplies files already read into memory; anything missing from it
+    is read from disk. Surfaces are made here, so this must run on the main thread.
+    """
+    global loaded, load_total_time, bw_source
+    if loaded:
+        return
+    start = time.perf_counter()
+    data = data or {}
+    bw_source = _bw_source(bw_mode)
+
+    # Every file to decode: (dict to store it in, name, path, keep alpha)
+    files = [(images, name, path, name != "bg") for name, path in IMAGE_FILES.items()]
+    if bw_source == BW_FILES:
+        files += [(bw_images, name, path, True) for name, path in BW_IMAGE_FILES.items()]
+    for store, name, path, alpha in files:
+        store[name] = _decode(path, alpha=alpha, data=data.get(path))
+
+    if bw_source == BW_TRANSFORM:
+        for name in BW_IMAGE_FILES:
+            bw_images[name] = pygame.transform.grayscale(images[name])
+
+    # Explosion animations for each size
+    for size, dimensions in EXPLOSION_SIZES.items():
+        explosion_frames[size] = [pygame.transform.scale(images[f"exp{num}"], dimensions)
+                                  for num in range(1, 6)]
+        bw_explosion_frames[size] = [pygame.transform.scale(bw_images[f"exp{num}"], dimensions)
+                                     for num in range(1, 6)]
+
+    # Resized special aliens
+    for num in range(1, 6):
+        for dimensions in SPECIAL_ALIEN_SIZES:
+            name = f"alien{num}"
+            scaled_images[(name, dimensions)] = pygame.transform.scale(images[name], dimensions)
+
+    # Collision masks for everything a sprite can be drawn with
+    for surface in list(images.values()) + list(scaled_images.values()):
+        mask(surface)
+
+    load_total_time = time.perf_counter() - start
+    loaded = True
+
+
+def image(name):
+    return images[name]
+
+
+def bw_image(name):
+    return bw_images[name]
+
+
+def scaled_image(name, dimensions):
+    """Return a resized copy of an image, built once and shared afterwards."""
+    key = (name, dimensions)
+    if key not in scaled_images:
+        scaled_images[key] = pygame.transform.scale(images[name], dimensions)
+    return scaled_images[key]
+
+
+def mask(surface):
+    """Return the collision mask for a shared surface, built the first time it is asked for."""
+    if surface not in masks:
+        masks[surface] = pygame.mask.from_surface(surface)
+    return masks[surface]
+
+
+def explosion(size):
+    """Return the (colour, black and white) frame lists for an explosion size."""
+    if size not in explosion_frames:
+        explosion_frames[size] = [images[f"exp{num}"] for num in range(1, 6)]
+        bw_explosion_frames[size] = [bw_images[f"exp{num}"] for num in range(1, 6)]
+    return explosion_frames[size], bw_explosion_frames[size]
+
+
+def load_report():
+    """Summarise what was loaded and how long it took."""
+    lines = [f"Loaded {decode_count} images in {load_total_time * 1000:.1f} ms "
+             f"(black and white: {bw_source})"]
+    slowest = sorted(load_times.items(), key=lambda item: item[1], reverse=True)[:5]
+    for path, seconds in slowest:
+        lines.append(f"  {path}: {seconds * 1000:.1f} ms")
+    return "\n".join(lines)
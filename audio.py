@@ -0,0 +1,122 @@
+import io
+import time
+import pygame
+from settings import SOUND_CHANNELS, SOUND_MIN_INTERVAL_MS
+
+# Sound effects, keyed by the name the engine plays them by: file and base volume
+SOUND_FILES = {
+    "laser": ("img/laser.ogg", 0.25),
+    "explosion": ("img/explosion.ogg", 0.25),
+    "explosion2": ("img/explosion2.ogg", 0.25),
+}
+
+
+# Sound effect playback. Every effect has its own reserved mixer channels, so a burst of lasers
+# can't cut off an explosion, and a play is dropped if the same effect started less than
+# SOUND_MIN_INTERVAL_MS ago or all of its channels are busy. Volumes are set when the volume
+# scale changes rather than before every play.
+class AudioManager:
+    def __init__(self):
+        self.sounds = {}  # name -> Sound, once loaded
+        self.channels = {}  # name -> the Channels reserved for it
+        self.last_played = {}  # name -> perf_counter time of its last play
+        self.scale = 1.0
+
+        # Statistics
+        self.played = dict.fromkeys(SOUND_FILES, 0)
+        self.rate_limited = dict.fromkeys(SOUND_FILES, 0)
+        self.dropped = dict.fromkeys(SOUND_FILES, 0)  # every channel for the effect was busy
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def loaded(self):
+        return bool(self.sounds)
+
+    @staticmethod
+    def read_files():
+        """Read every effect's file into memory; returns name -> bytes, or None if one is missing.
+
+        This is only file I/O, so unlike load() it is safe to run off the main thread.
+        """
+        data = {}
+        try:
+            for name, (path, _) in SOUND_FILES.items():
+                with open(path, "rb") as f:
+                    data[name] = f.read()
+        except OSError:
+            return None
+        return data
+
+    def load(self, data=None):
+        """Load the effects and reserve their channels; False if there is no usable mixer.
+
+        data (from read_files()) supplies the files already read into memory.
+        """
+        if not pygame.mixer.get_init():
+            return False
+        try:
+            if data is not None:
+                sounds = {name: pygame.mixer.Sound(file=io.BytesIO(data[name]))
+                          for name in SOUND_FILES}
+            else:
+                sounds = {name: pygame.mixer.Sound(path) for name, (path, _) in SOUND_FILES.items()}
+        except (pygame.error, OSError):
+            return False
+
+        # Channels below set_reserved() are never handed out by Sound.play() or find_channel()
+        reserved = sum(SOUND_CHANNELS.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved))
+        pygame.mixer.set_reserved(reserved)
+        first = 0
+        for name in SOUND_FILES:
+            count = SOUND_CHANNELS[name]
+            self.channels[name] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+
+        self.sounds = sounds
+        self.apply_volume()
+        return True
+
+    def set_volume_scale(self, scale):
+        """Scale every effect's base volume; only does any work when the scale changes."""
+        if scale != self.scale:
+            self.scale = scale
+            self.apply_volume()
+
+    def apply_volume(self):
+        for name, sound in self.sounds.items():
+            sound.set_volume(SOUND_FILES[name][1] * self.scale)
+
+    def play(self, name):
+        if name not in self.sounds:
+            return False
+        start = time.perf_counter()
+        last = self.last_played.get(name)
+        if last is not None and (start - last) * 1000 < SOUND_MIN_INTERVAL_MS[name]:
+            self.rate_limited[name] += 1
+            return False
+        channel = next((channel for channel in self.channels[name] if not channel.get_busy()), None)
+        if channel is None:
+            self.dropped[name] += 1
+            return False
+
+        channel.play(self.sounds[name])
+        latency = time.perf_counter() - start
+        self.last_played[name] = start
+        self.played[name] += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        return True
+
+    def stats(self):
+        played = sum(self.played.values())
+        return {
+            "played": played,
+            "rate_limited": sum(self.rate_limited.values()),
+            "dropped": sum(self.dropped.values()),
+            "by_effect": {name: (self.played[name], self.rate_limited[name], self.dropped[name])
+                          for name in SOUND_FILES},
+            "mean_latency_ms": self.total_latency / played * 1000 if played else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
@@ -0,0 +1,370 @@
+import os
+import sys
+import glob
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+
+# headless sets up the dummy SDL drivers before pygame is imported
+from headless import ScriptedPlayer, init_headless
+import pygame
+from settings import screen_width, screen_height, MODE_NORMAL, BW_AUTO, BW_MODES
+from engine import GameEngine
+from clock import FrameClock
+import render
+from render import Renderer, DirtyRenderer
+from rest_logic import append_stats_record
+from replay import ReplayPlayer, load_replay, replay_game, outcome
+
+BASELINE_FILE = "benchmark_baseline.json"
+REPLAY_DIR = "replays"  # Recorded sessions run as extra scenarios by default
+
+# Metrics compared against the baseline; higher is worse for all of them. transient_kb_per_frame
+# is memory allocated within a frame on top of what was live when it started (tracemalloc bytes,
+# not a count of allocations); pool_misses_per_frame counts sprites built because a pool was empty.
+METRICS = ["mean_ms", "p95_ms", "p99_ms", "transient_kb_per_frame", "peak_kb",
+           "font_renders_per_frame", "pool_misses_per_frame"]
+
+# Stress scenarios, by name
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(setup):
+        SCENARIOS[name] = setup
+        return setup
+    return register
+
+
+@scenario("formation_8x8")
+def formation_8x8(game):
+    # Largest regular grid create_aliens can build
+    game.create_formation(8, 8)
+
+
+@scenario("boss_wave")
+def boss_wave(game):
+    game.current_level = 5
+    game.create_aliens()
+
+
+@scenario("alien_bullets")
+def alien_bullets(game):
+    game.create_formation(5, 5)
+
+    # Pool sized for the flood, so this measures bullet updates and drawing rather than pool misses
+    game.alien_bullet_pool.capacity = 160
+    game.alien_bullet_pool.prefill(0, 0)
+
+    # Keep the screen saturated with alien bullets
+    def refill():
+        while len(game.alien_bullet_group) < 150:
+            x = random.randint(10, screen_width - 10)
+            y = random.randint(0, screen_height)
+            game.alien_bullet_pool.acquire(x, y)
+    refill()
+    return refill
+
+
+@scenario("explosions")
+def explosions(game):
+    game.create_formation(5, 5)
+
+    # Dozens of explosions at once, replaced as they finish
+    def refill():
+        while len(game.explosion_group) < 40:
+            x = random.randint(0, screen_width)
+            y = random.randint(0, screen_height)
+            game.explosion_pool.acquire(x, y, random.randint(1, 3))
+    refill()
+    return refill
+
+
+@scenario("black_and_white")
+def black_and_white(game):
+    game.create_formation(8, 8)
+    game.black_and_white = True
+
+
+def prepare_game(setup):
+    """Build a game already in active play and apply a scenario to it."""
+    clock = FrameClock()
+    game = GameEngine(persist=False, clock=clock, seed=0)
+    game.select_mode(MODE_NORMAL)
+    game.clear_aliens()
+
+    # Skip the countdown and keep break reminders and deaths out of the measurement
+    game.countdown = 0
+    game.restart_reminder(clock.time())
+    game.spaceship.health_start = game.spaceship.health_remaining = 10 ** 6
+
+    refill = setup(game)
+    return game, clock, refill, ScriptedPlayer()
+
+
+def prepare_replay(replay):
+    """Start a recorded session from the beginning, driven by its recorded input."""
+    game, clock = replay_game(replay)
+    return game, clock, None, ReplayPlayer(replay)
+
+
+def replay_scenarios(paths):
+    """Load replay files as scenarios named replay:<file name>."""
+    scenarios = {}
+    for path in paths:
+        name = "replay:" + os.path.basename(path).split(".")[0]
+        scenarios[name] = load_replay(path)
+    return scenarios
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def pool_misses(game):
+    pools = (game.bullet_pool, game.alien_bullet_pool, game.explosion_pool)
+    return sum(pool.misses for pool in pools)
+
+
+def run_frames(game, clock, refill, renderer, player, frames, on_frame=None):
+    for _ in range(frames):
+        if on_frame:
+            on_frame(True)
+        if refill:
+            refill()
+        game.step(player(game))
+        dirty_rects = renderer.draw(game, (0, 0))
+        if dirty_rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(dirty_rects)
+        clock.advance()
+        if on_frame:
+            on_frame(False)
+
+
+def run_scenario(name, frames, warmup, renderer, replay=None):
+    """Measure frame times and memory for one scenario, or for a whole replay when one is given."""
+    if replay:
+        prepare = lambda: prepare_replay(replay)
+        frames, warmup = replay["frames"], 0
+    else:
+        prepare = lambda: prepare_game(SCENARIOS[name])
+
+    # Timing pass
+    random.seed(0)
+    game, clock, refill, player = prepare()
+    run_frames(game, clock, refill, renderer, player, warmup)
+    frame_times = []
+    frame_start = [0.0]
+
+    def time_frame(starting):
+        if starting:
+            frame_start[0] = time.perf_counter()
+        else:
+            frame_times.append((time.perf_counter() - frame_start[0]) * 1000)
+    renders_before = render.font_render_count
+    misses_before = pool_misses(game)
+    run_frames(game, clock, refill, renderer, player, frames, time_frame)
+    font_renders = render.font_render_count - renders_before
+    misses = pool_misses(game) - misses_before
+    matches = outcome(game) == replay["outcome"] if replay else None
+
+    # Memory pass, kept separate because tracing slows every allocation down
+    random.seed(0)
+    game, clock, refill, player = prepare()
+    run_frames(game, clock, refill, renderer, player, warmup)
+    transient = []
+    tracemalloc.start()
+
+    def trace_frame(starting):
+        if starting:
+            tracemalloc.reset_peak()
+            frame_start[0] = tracemalloc.get_traced_memory()[0]
+        else:
+            # Memory allocated on top of what was live at the start of the frame
+            transient.append(tracemalloc.get_traced_memory()[1] - frame_start[0])
+    run_frames(game, clock, refill, renderer, player, frames, trace_frame)
+    tracemalloc.stop()
+    peak_kb = max(transient) / 1024 if transient else 0.0
+
+    results = {
+        "mean_ms": sum(frame_times) / len(frame_times),
+        "p95_ms": percentile(frame_times, 95),
+        "p99_ms": percentile(frame_times, 99),
+        "transient_kb_per_frame": sum(transient) / len(transient) / 1024,
+        "peak_kb": peak_kb,
+        "font_renders_per_frame": font_renders / frames,
+        "pool_misses_per_frame": misses / frames,
+    }
+    if replay:
+        # A replay that ends differently no longer exercises what it recorded
+        results["matches_recording"] = matches
+    return results
+
+
+def run_benchmarks(names, frames, warmup, dirty_rects=False, cached_hud=True, bw_mode=BW_AUTO,
+                   replays=None):
+    screen = init_headless(render=True, bw_mode=bw_mode)
+    replays = replays or {}
+    results = {}
+    for name in list(names) + list(replays):
+        renderer_class = DirtyRenderer if dirty_rects else Renderer
+        renderer = renderer_class(screen, cached_hud, bw_mode)
+        results[name] = run_scenario(name, frames, warmup, renderer, replays.get(name))
+    return {
+        "frames": frames,
+        "renderer": "dirty" if dirty_rects else "full",
+        "cached_hud": cached_hud,
+        "bw_mode": bw_mode,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "scenarios": results,
+    }
+
+
+def legacy_save_stats(path, record):
+    """The old save_game_stats: load the whole array, append, rewrite it."""
+    with open(path, "r") as f:
+        all_stats = json.load(f)
+    all_stats.append(record)
+    with open(path, "w") as f:
+        json.dump(all_stats, f, indent=2)
+
+
+def run_stats_log_benchmark(sizes=(0, 1000, 10000, 100000), samples=5):
+    """Median time of one stats write to files holding `size` sessions, old format vs log."""
+    record = {"timestamp": "2025-01-01T00:00:00", "mode": MODE_NORMAL, "duration": 300,
+              "took_break": False, "level": 3, "breaks_ignored": 0}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            legacy_path = f"{tmp}/game_data_{size}.json"
+            log_path = f"{tmp}/game_data_{size}.jsonl"
+            with open(legacy_path, "w") as f:
+                json.dump([record] * size, f, indent=2)
+            with open(log_path, "w") as f:
+                f.writelines(json.dumps(record) + "\n" for _ in range(size))
+
+            timings = {"legacy_ms": [], "log_ms": []}
+            for _ in range(samples):
+                start = time.perf_counter()
+                legacy_save_stats(legacy_path, record)
+                timings["legacy_ms"].append((time.perf_counter() - start) * 1000)
+                start = time.perf_counter()
+                append_stats_record(record, log_path)
+                timings["log_ms"].append((time.perf_counter() - start) * 1000)
+            results[size] = {name: statistics.median(values) for name, values in timings.items()}
+    return results
+
+
+def compare(baseline, current, tolerance):
+    """Print a diff against the baseline and return the list of regressions."""
+    regressions = []
+    print(f"{'scenario':<24}{'metric':<24}{'baseline':>10}{'current':>10}{'change':>9}")
+    for name, metrics in current["scenarios"].items():
+        old_metrics = baseline.get("scenarios", {}).get(name)
+        if old_metrics is None:
+            print(f"{name:<24}(not in baseline)")
+            continue
+        for metric in METRICS:
+            old = old_metrics.get(metric)
+            new = metrics[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            flag = ""
+            if change > tolerance:
+                flag = "  REGRESSION"
+                regressions.append((name, metric, old, new))
+            print(f"{name:<24}{metric:<24}{old:>10.3f}{new:>10.3f}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def print_results(results):
+    print(f"{'scenario':<24}" + "".join(f"{metric:>24}" for metric in METRICS))
+    for name, metrics in results["scenarios"].items():
+        print(f"{name:<24}" + "".join(f"{metrics[metric]:>24.3f}" for metric in METRICS))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Frame-time benchmarks for the game update and draw path")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=30, help="frames run before measuring")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only these scenarios")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="benchmark the dirty-rectangle renderer")
+    parser.add_argument("--no-hud-cache", dest="cached_hud", action="store_false",
+                        help="render the HUD text every frame, as before the cached HUD")
+    parser.add_argument("--bw-mode", choices=BW_MODES, default=BW_AUTO,
+                        help="how black and white mode is drawn "
+                             "(compare with --scenario black_and_white)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline results file")
+    parser.add_argument("--save", action="store_true",
+                        help="save these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed slowdown before flagging, e.g. 0.1 = 10%%")
+    parser.add_argument("--replay", action="append", metavar="FILE",
+                        help=f"also run this recorded replay "
+                             f"(default: every file in {REPLAY_DIR}/ unless --scenario is given)")
+    parser.add_argument("--stats-log", action="store_true",
+                        help="time one stats write at growing history sizes instead of running "
+                             "frames")
+    args = parser.parse_args(argv)
+
+    if args.stats_log:
+        print(f"{'sessions':>10}{'rewrite array ms':>20}{'append log ms':>20}")
+        for size, timing in run_stats_log_benchmark().items():
+            print(f"{size:>10}{timing['legacy_ms']:>20.3f}{timing['log_ms']:>20.3f}")
+        return 0
+
+    names = args.scenario or list(SCENARIOS)
+    replay_paths = args.replay
+    if replay_paths is None and not args.scenario:
+        replay_paths = sorted(glob.glob(os.path.join(REPLAY_DIR, "*.gz")))
+    replays = replay_scenarios(replay_paths or [])
+    results = run_benchmarks(names, args.frames, args.warmup, args.dirty_rects, args.cached_hud,
+                             args.bw_mode, replays)
+    print_results(results)
+    diverged = [name for name, metrics in results["scenarios"].items()
+                if metrics.get("matches_recording") is False]
+    for name in diverged:
+        print(f"{name}: game ended differently from the recording")
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 1 if diverged else 0
+
+    try:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        print(f"No baseline at {args.baseline}; run with --save to create one")
+        return 1 if diverged else 0
+
+    print()
+    regressions = compare(baseline, results, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        return 1
+    if diverged:
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
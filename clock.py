@@ -0,0 +1,76 @@
+import time
+import pygame
+from settings import fps
+
+
+# Where the game reads the time: time() in seconds for the break timers and the weekly
+# leaderboard, ticks() in milliseconds for gameplay cooldowns. GameEngine takes either clock.
+class SystemClock:
+    def time(self):
+        return time.time()
+
+    def ticks(self):
+        return pygame.time.get_ticks()
+
+
+# Simulated time that moves forward exactly one frame per advance(), however fast the
+# simulation runs, so hours of break reminders and cooldowns can be stepped through in seconds.
+# The windowed game advances one per fixed tick, so gameplay timing never depends on frame timing.
+class FrameClock:
+    def __init__(self, frame_rate=fps, start=None):
+        self.frame_rate = frame_rate
+        self.frame = 0
+        self.start = time.time() if start is None else start
+        self.skipped_ms = 0  # Time jumped over with skip()
+        self.dropped_ms = 0  # Wall time passed without simulating it, see drop()
+
+    def time(self):
+        skipped = (self.skipped_ms + self.dropped_ms) / 1000
+        return self.start + self.frame / self.frame_rate + skipped
+
+    def ticks(self):
+        return int(self.frame * 1000 / self.frame_rate) + self.skipped_ms
+
+    def advance(self):
+        self.frame += 1
+
+    def skip(self, seconds):
+        """Jump ahead without stepping, e.g. past a break or to the next leaderboard week."""
+        self.skipped_ms += round(seconds * 1000)
+
+    def drop(self, seconds):
+        """Let time() catch up with wall time the game loop could not simulate; ticks() stays put.
+
+        Break timers and session lengths then still follow real time, while gameplay cooldowns
+        only ever see whole ticks.
+        """
+        self.dropped_ms += round(seconds * 1000)
+
+
+# Turns real frame times into whole fixed ticks. Time left over after the last whole tick is
+# carried into the next frame and tells the renderer how far to interpolate.
+class FixedTimestep:
+    def __init__(self, tick_rate, max_ticks_per_frame):
+        self.tick_seconds = 1.0 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0
+
+    def advance(self, seconds):
+        """Add a frame's real duration; returns (ticks to run now, seconds dropped).
+
+        A frame that is more than max_ticks_per_frame ticks behind runs only that many and drops
+        the rest, rather than falling further behind with every frame.
+        """
+        self.accumulator += seconds
+        ticks = int(self.accumulator // self.tick_seconds)
+        self.accumulator %= self.tick_seconds
+        if ticks <= self.max_ticks_per_frame:
+            return ticks, 0.0
+        dropped = (ticks - self.max_ticks_per_frame) * self.tick_seconds + self.accumulator
+        self.accumulator = 0.0
+        return self.max_ticks_per_frame, dropped
+
+    @property
+    def alpha(self):
+        """How far between the last tick and the next one this frame falls, in [0, 1)."""
+        return self.accumulator / self.tick_seconds
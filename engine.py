@@ -0,0 +1,733 @@
+import pygame
+import random
+import time
+import json
+import os
+from settings import (POOL_CAPACITY, TUNING, LEVEL_UP_MS, PREFETCH_AT_ALIENS, screen_width,
+                      screen_height, STATE_NORMAL_PLAY, STATE_BREAK_REMINDER, STATE_BREAK_TAKEN,
+                      STATE_COOLDOWN_ACTIVE, STATE_ENFORCED_COOLDOWN, STATE_LEADERBOARD_MINI,
+                      MODE_NORMAL, MODE_BREAK_AWARE)
+from sprites import Spaceship, Bullets, Aliens, Alien_Bullets, Explosion, Formation
+from pools import SpritePool, OVERFLOW_GROW
+from spatial import SpatialHash
+from rest_logic import BreakPolicy
+from persistence import atomic_write_json
+from profiler import PhaseTimer
+from tracing import Tracer
+from clock import SystemClock
+from scheduler import Scheduler
+
+# Define break messages
+break_messages = [
+    "You've been doing great! How about a short break to recharge your mind?",
+    "Nice streak! Taking a 5-minute pause might help you come back sharper.",
+    "You're on fire! Let's take a moment to breathe and reset.",
+    "Still enjoying it? That's awesome. Just checking in—"
+    "would now be a good time to rest your eyes?",
+    "Time flies when you're in the zone. Would you like to pause and stretch a little?",
+    "Balance is part of the game too. Take a quick break, and we'll be here when you return.",
+    "Stretch. Hydrate. Breathe. A quick break now could boost your next round.",
+    "Gaming feels better when you feel better. Take care of your body as well as your score!",
+    "Great choice taking a break! Your focus bar just leveled up.",
+    "Well done for stepping back! Champions know when to pause.",
+    "You chose to pause—smart move. See you soon, sharper than ever!"
+]
+
+
+# Player input for a single frame
+class FrameInput:
+    def __init__(self, left=False, right=False, fire=False, pause=False, touch=None, taps=(),
+                 actions=()):
+        self.left = left
+        self.right = right
+        self.fire = fire
+        self.pause = pause  # P key held (voluntary break during cooldown)
+        self.touch = touch  # Current touch position while a touch is held, otherwise None
+        self.taps = list(taps)  # Positions of new touches this frame
+        # UI decisions made this frame, e.g. "take_break", "ignore_break", "new_game", "quit"
+        self.actions = list(actions)
+
+
+# Timers the break state machine registers with the scheduler
+TIMER_REMINDER = "break_reminder"  # Next break reminder; paused while the game is over
+TIMER_STATE = "state"  # End of the current timed state (reminder, break, enforced break, cooldown)
+TIMER_LEADERBOARD = "weekly_leaderboard"
+TIMER_HISTORY = "history_check"  # Look for session history saved by another process
+
+ONE_WEEK = 7 * 24 * 60 * 60
+
+
+# A level's aliens, built but not yet in play
+class Wave:
+    def __init__(self, game, level, rng):
+        self.level = level
+        self.random = rng  # Where the aliens' types and positions come from
+        self.aliens = []  # Every alien, in the order they were made
+        self.roaming = []  # Boss and special aliens, which move on their own
+        self.formation = Formation(game, level)  # Regular aliens, moved together
+        self.rows = None  # Grid size, for regular levels
+        self.cols = None
+
+    def add(self, alien, roaming=False):
+        self.aliens.append(alien)
+        if roaming:
+            self.roaming.append(alien)
+        else:
+            self.formation.add(alien)
+
+
+# Game simulation: everything that happens in a frame except drawing and event polling
+class GameEngine:
+    def __init__(self, persist=True, clock=None,
+                 pool_capacity=None, pool_overflow=OVERFLOW_GROW, persister=None, tracer=None,
+                 seed=None, tuning=None):
+        # When persist is False nothing is read from or written to the JSON files
+        self.persist = persist
+        # Optional PersistenceWorker; without one, saves are written on this thread
+        self.persister = persister
+
+        # Every timer reads this clock: seconds for the break timers, milliseconds for gameplay
+        # cooldowns. A headless run passes a FrameClock so it can run faster than real time.
+        self.clock = clock or SystemClock()
+        self.time = self.clock.time
+        self.ticks = self.clock.ticks
+        self.running = True
+
+        # Break and difficulty heuristics, settings.TUNING with any overrides
+        self.tuning = dict(TUNING, **(tuning or {}))
+
+        # Gameplay randomness (alien types, special aliens, who shoots) comes only from self.random,
+        # so a seed and the inputs reproduce a run. Break messages are picked while drawing and
+        # use their own generator, so whether a frame is drawn never changes the gameplay.
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.message_random = random.Random(seed)
+
+        # Optional Tracer for --trace; a disabled one otherwise, so call sites need no checks
+        self.tracer = tracer or Tracer(capacity=0, enabled=False)
+
+        # Called with "laser", "explosion" or "explosion2" when a sound should play
+        self.sound_player = None
+
+        # Define game variables
+        self.rows = 5
+        self.cols = 5
+        self.alien_cooldown = 1000  # bullet cooldown in milliseconds
+        self.last_alien_shot = self.ticks()
+        self.countdown = 3
+        self.last_count = self.ticks()
+        self.game_over = 0  # 0 is no game over, 1 means player has won, -1 means player has lost
+
+        # Current state and mode
+        self.current_state = STATE_NORMAL_PLAY
+        self.current_mode = MODE_NORMAL
+        self.game_mode_selected = False
+
+        # Timers
+        self.play_start_time = 0
+        self.cooldown_start_time = 0
+        self.break_start_time = 0
+        self.break_duration = self.tuning["break_duration"]  # seconds for break
+        # Seconds before cooldown if ignored
+        self.ignore_duration_threshold = self.tuning["ignore_duration"]
+        self.last_break_reminder = 0  # Track last break reminder time
+        self.reminder_pending = False  # A reminder came due while it could not be shown
+        self.dynamic_break_threshold = 300  # Default 5 minutes, will be calculated later
+        # Every break and leaderboard deadline; tick() only acts on the ones that are due
+        self.scheduler = Scheduler(self.time)
+        # Session history, loaded once
+        self.break_policy = BreakPolicy(persist, ratio=self.tuning["break_ratio"],
+                                        default_threshold=self.tuning["default_break_interval"],
+                                        alpha=self.tuning["break_ewma_alpha"], writer=persister)
+
+        # Progressive cooldown variables
+        self.breaks_ignored_count = 0
+        self.cooldown_intensity = 0  # 0-100 scale for intensity
+        self.max_cooldown_intensity = 100
+        self.hide_progression = False  # Flag to hide progression display
+        self.hide_score = False  # Flag to hide score display
+        self.black_and_white = False  # Flag for black and white mode
+
+        # Scores and statistics
+        self.score = 0
+        self.high_score = 0
+        self.current_level = 1
+        self.max_level_reached = 1
+        self.weekly_stats = {
+            "games_played": 0,
+            "breaks_taken": 0,
+            "breaks_ignored": 0,
+            "total_play_time": 0,
+            "high_score": 0,
+            "max_level": 1,
+            "last_leaderboard_check": self.time()
+        }
+        self.current_break_message = ""
+
+        # Set when a level has just been completed, so the front end can announce it
+        self.level_up = False
+        self.level_up_until = 0  # ticks() when the "LEVEL n!" pause between waves ends
+        self.next_wave = None  # Wave for the next level, built while this one is finishing
+
+        # Create sprite groups
+        self.spaceship_group = pygame.sprite.Group()
+        self.bullet_group = pygame.sprite.Group()
+        self.alien_group = pygame.sprite.Group()
+        # Boss and special aliens, which move on their own
+        self.roaming_aliens = pygame.sprite.Group()
+        self.formation = Formation(self)  # Regular aliens, moved together
+        self.alien_bullet_group = pygame.sprite.Group()
+        self.explosion_group = pygame.sprite.Group()
+        self.moving_groups = [self.spaceship_group, self.bullet_group, self.alien_group,
+                              self.alien_bullet_group]
+
+        # Where each moving sprite was before the last step, for render interpolation.
+        # Only recorded when a front end turns track_positions on.
+        self.track_positions = False
+        self.previous_positions = {}
+
+        # Recycled bullets and explosions, so firing and kills don't allocate new sprites
+        capacity = dict(POOL_CAPACITY, **(pool_capacity or {}))
+        self.bullet_pool = SpritePool(lambda x, y: Bullets(self, x, y), self.bullet_group,
+                                      capacity["bullets"], pool_overflow, prefill_args=(0, 0))
+        self.alien_bullet_pool = SpritePool(lambda x, y: Alien_Bullets(self, x, y),
+                                            self.alien_bullet_group, capacity["alien_bullets"],
+                                            pool_overflow, prefill_args=(0, 0))
+        self.explosion_pool = SpritePool(Explosion, self.explosion_group, capacity["explosions"],
+                                         pool_overflow, prefill_args=(0, 0, 1))
+
+        # Broadphase for bullet-vs-alien collisions
+        self.alien_grid = SpatialHash()
+        self.mask_tests = 0  # Pixel-mask collision tests this frame
+
+        # Per-phase timings for the debug overlay, off unless a front end turns them on
+        self.profiler = PhaseTimer()
+        if tracer:
+            self.profiler.set_tracer(tracer)
+
+        # Create player
+        self.spaceship = Spaceship(self, int(screen_width / 2), screen_height - 100, 3)
+        self.spaceship_group.add(self.spaceship)
+
+        self.initialize_break_threshold()
+        self.weekly_stats = self.load_leaderboard()
+        self.schedule_weekly_leaderboard()
+        if self.persist and self.break_policy.check_interval is not None:
+            self.scheduler.schedule(TIMER_HISTORY, self.break_policy.check_interval)
+        self.create_aliens()
+        self.session_start_time = self.time()
+        self.first_game_start = True  # Flag to track if this is the first game start
+
+    def play_sound(self, name):
+        if self.sound_player:
+            self.sound_player(name)
+
+    def snap_position(self, sprite):
+        """Draw a sprite that was just moved somewhere new there, not sliding from the old spot."""
+        self.previous_positions.pop(sprite, None)
+
+    def sound_volume(self):
+        """Volume scale for sound effects, lowered by the cooldown intensity during the cooldown."""
+        if self.current_state == STATE_COOLDOWN_ACTIVE:
+            return (100.0 - self.cooldown_intensity) / 100.0
+        return 1.0
+
+    # Load or create leaderboard data
+    def load_leaderboard(self):
+        try:
+            if self.persist and os.path.exists("leaderboard.json"):
+                with open("leaderboard.json", "r") as f:
+                    data = json.load(f)
+                    # Update max level reached from saved data
+                    if "max_level" in data:
+                        self.max_level_reached = data["max_level"]
+                    return data
+        except:
+            pass
+        return self.weekly_stats
+
+    def save_leaderboard(self):
+        # Update max level in stats before saving
+        self.weekly_stats["max_level"] = max(self.weekly_stats["max_level"], self.max_level_reached)
+
+        if not self.persist:
+            return
+        if self.persister:
+            # Hand the worker a snapshot; weekly_stats keeps changing on this thread
+            self.persister.write_json("leaderboard.json", dict(self.weekly_stats))
+        else:
+            atomic_write_json("leaderboard.json", self.weekly_stats)
+
+    # The weekly leaderboard shows a week after it last did
+    def schedule_weekly_leaderboard(self):
+        self.scheduler.at(TIMER_LEADERBOARD, self.weekly_stats["last_leaderboard_check"] + ONE_WEEK)
+
+    # Initialize break threshold from session data
+    def initialize_break_threshold(self):
+        previous = self.dynamic_break_threshold
+        self.dynamic_break_threshold = self.break_policy.threshold
+        # Move a running reminder timer by the change, keeping any time it spent paused
+        remaining = self.scheduler.remaining(TIMER_REMINDER)
+        if remaining is not None:
+            delay = remaining + self.dynamic_break_threshold - previous
+            self.scheduler.schedule(TIMER_REMINDER, delay, pausable=True)
+
+    def create_aliens(self):
+        """Put the wave for the current level in play, using the prefetched one if it matches."""
+        wave = self.next_wave
+        if wave is None or wave.level != self.current_level:
+            wave = self.build_wave(self.current_level)
+        self.next_wave = None
+        self.install_wave(wave)
+
+    def build_wave(self, level, rng=None):
+        """Build the aliens for a level without putting them in play.
+
+        Random choices are drawn from rng, self.random by default.
+        """
+        started = time.perf_counter()
+        rng = rng or self.random
+        # Generate aliens - number increases with level
+        wave = Wave(self, level, rng)
+
+        # For levels 5 and above, create special challenges
+        if level >= 5:
+            # Create boss for every 5th level
+            if level % 5 == 0:
+                boss = Aliens(self, screen_width // 2, 100, level, rng)
+                boss.make_boss()
+                wave.add(boss, roaming=True)
+            else:
+                # Create special aliens for other high levels
+                num_special = min(level // 5, 3)  # More special aliens as level increases
+                for i in range(num_special):
+                    x = rng.randint(100, screen_width-100)
+                    alien = Aliens(self, x, 100 + i * 70, level, rng)
+                    special_type = rng.choice(["fast", "tank", "zigzag"])
+                    alien.make_special(special_type)
+                    wave.add(alien, roaming=True)
+
+                # Add some regular aliens
+                for i in range(3):
+                    x = rng.randint(100, screen_width-100)
+                    wave.add(Aliens(self, x, 300 + i * 70, level, rng))
+        else:
+            # Regular levels (1-4)
+            base_rows = 5
+            base_cols = 5
+
+            # Add more rows and columns as level increases
+            rows = min(base_rows + (level - 1) // 2, 8)
+            cols = min(base_cols + (level - 1) // 3, 8)
+            self.build_grid(wave, rows, cols)
+        self.tracer.complete("build_wave", "level", started, args={"level": level})
+        return wave
+
+    def prefetch_random(self, level):
+        """Random generator for a wave built ahead of time.
+
+        It is seeded from the game seed and the level rather than drawing on self.random, so
+        building the next wave early never changes which alien fires next in the current one.
+        """
+        if self.seed is None:
+            return random.Random()
+        return random.Random(f"{self.seed}:wave:{level}")
+
+    def build_grid(self, wave, rows, cols):
+        # Regular aliens laid out in a grid
+        wave.rows = rows
+        wave.cols = cols
+        for row in range(rows):
+            for item in range(cols):
+                wave.add(Aliens(self, 100 + item * 100, 100 + row * 70, wave.level, wave.random))
+
+    def create_formation(self, rows, cols):
+        """Put a grid of regular aliens in play in place of the current wave."""
+        wave = Wave(self, self.current_level, self.random)
+        self.build_grid(wave, rows, cols)
+        self.install_wave(wave)
+
+    def install_wave(self, wave):
+        self.clear_aliens()
+        self.alien_group.add(wave.aliens)
+        self.roaming_aliens.add(wave.roaming)
+        self.formation = wave.formation
+        if wave.rows:
+            self.rows = wave.rows
+            self.cols = wave.cols
+
+    @property
+    def level_transition(self):
+        """True while "LEVEL n!" is showing between waves; the aliens hold still until it ends."""
+        return self.ticks() < self.level_up_until
+
+    def clear_aliens(self):
+        self.alien_group.empty()
+        self.roaming_aliens.empty()
+        self.formation = Formation(self)
+
+    # Reset game function
+    def reset_game(self):
+        # Clear all sprite groups
+        self.bullet_pool.clear()
+        self.alien_group.empty()
+        self.alien_bullet_pool.clear()
+        self.explosion_pool.clear()
+        self.spaceship_group.empty()  # Clear spaceship group
+
+        # Reset game variables but preserve cooldown and level
+        self.game_over = 0
+        self.countdown = 3
+        self.score = 0
+        # Don't reset black_and_white here, only reset it when taking a break
+
+        # Create new aliens for current level
+        self.create_aliens()
+
+        # Reset player
+        # Create a new spaceship
+        self.spaceship = Spaceship(self, int(screen_width / 2), screen_height - 100, 3)
+        self.spaceship_group.add(self.spaceship)  # Add to sprite group
+
+        # Reset break-aware system but preserve cooldown state
+        if self.current_state != STATE_COOLDOWN_ACTIVE:
+            self.enter_state(STATE_NORMAL_PLAY)
+        self.play_start_time = self.time()
+
+        # Time spent on the game over screen doesn't count towards the next reminder
+        self.scheduler.resume()
+
+        # Update stats
+        self.weekly_stats["games_played"] += 1
+
+    def select_mode(self, mode):
+        self.current_mode = mode
+        self.game_mode_selected = True
+        self.play_start_time = self.time()
+
+    def record_session_stats(self):
+        # Save stats before quitting
+        self.weekly_stats["total_play_time"] += int(self.time() - self.session_start_time)
+        if self.score > self.weekly_stats["high_score"]:
+            self.weekly_stats["high_score"] = self.score
+        self.save_leaderboard()
+
+    def quit(self):
+        self.record_session_stats()
+        self.running = False
+
+    def new_game(self):
+        # Update high score before reset
+        if self.score > self.weekly_stats["high_score"]:
+            self.weekly_stats["high_score"] = self.score
+        self.reset_game()
+
+    def take_break(self):
+        current_time = self.time()
+        # Only update last_break_reminder when player makes a choice
+        self.restart_reminder(current_time)
+        self.weekly_stats["breaks_taken"] += 1
+        self.current_break_message = ""  # Reset message
+        self.enter_state(STATE_BREAK_TAKEN, current_time)
+
+    def ignore_break(self):
+        current_time = self.time()
+        self.breaks_ignored_count += 1
+        self.weekly_stats["breaks_ignored"] += 1
+        # Only update last_break_reminder when player makes a choice
+        self.restart_reminder(current_time)
+
+        # Then check if we need to enter cooldown
+        if self.current_mode == MODE_BREAK_AWARE:
+            self.enter_state(STATE_ENFORCED_COOLDOWN, current_time)
+        else:
+            self.enter_state(STATE_COOLDOWN_ACTIVE, current_time)
+
+        # Set cooldown intensity based on number of ignored breaks
+        if self.breaks_ignored_count == 1:
+            self.cooldown_intensity = 25
+        elif self.breaks_ignored_count == 2:
+            self.cooldown_intensity = 50
+        elif self.breaks_ignored_count == 3:
+            self.black_and_white = True
+        elif self.breaks_ignored_count == 4:
+            self.cooldown_intensity = 75
+        elif self.breaks_ignored_count == 5:
+            self.cooldown_intensity = 100
+        elif self.breaks_ignored_count == 6:
+            self.hide_progression = True
+        elif self.breaks_ignored_count == 7:
+            self.hide_score = True
+
+        self.current_break_message = ""  # Reset message
+
+    def show_leaderboard(self):
+        self.enter_state(STATE_LEADERBOARD_MINI)
+
+    def dismiss_leaderboard(self):
+        if self.current_state == STATE_LEADERBOARD_MINI:
+            self.enter_state(STATE_NORMAL_PLAY)
+            # Ensure spaceship is in the sprite group when returning from leaderboard
+            self.restore_spaceship()
+
+    def restore_spaceship(self):
+        if len(self.spaceship_group) == 0 and self.spaceship.health_remaining > 0:
+            self.spaceship_group.add(self.spaceship)
+
+    def break_time_remaining(self):
+        return max(0, self.break_duration - (self.time() - self.break_start_time))
+
+    def end_break(self, current_time):
+        self.play_start_time = current_time
+        self.restart_reminder(current_time)  # Reset the break reminder timer
+        # Reset cooldown intensity and breaks ignored count after a proper break
+        self.cooldown_intensity = 0
+        self.breaks_ignored_count = 0
+        self.hide_progression = False
+        self.hide_score = False
+        self.black_and_white = False  # Reset black and white effect
+        self.enter_state(STATE_NORMAL_PLAY, current_time)
+
+        # Ensure spaceship is in the sprite group after break
+        self.restore_spaceship()
+
+    def apply_action(self, action):
+        if action == "quit":
+            self.quit()
+        elif action == "leaderboard":
+            self.show_leaderboard()
+        elif action == "dismiss_leaderboard":
+            self.dismiss_leaderboard()
+        elif action == "mode_normal":
+            self.select_mode(MODE_NORMAL)
+        elif action == "mode_break_aware":
+            self.select_mode(MODE_BREAK_AWARE)
+        elif action == "new_game":
+            self.new_game()
+        elif action == "take_break":
+            self.take_break()
+        elif action == "ignore_break":
+            self.ignore_break()
+
+    # Break state machine. Every state change goes through enter_state, which also sets the timer
+    # for states that end on their own; the scheduler then calls back into on_timer when it is due.
+    def state_duration(self, state):
+        """Seconds a timed state lasts before on_state_timeout moves on.
+
+        None if the state doesn't end by itself.
+        """
+        return {
+            STATE_BREAK_REMINDER: self.ignore_duration_threshold,
+            STATE_BREAK_TAKEN: self.break_duration,
+            STATE_ENFORCED_COOLDOWN: self.break_duration,
+            STATE_COOLDOWN_ACTIVE: self.ignore_duration_threshold,
+        }.get(state)
+
+    def enter_state(self, state, current_time=None):
+        if current_time is None:
+            current_time = self.time()
+        self.current_state = state
+        if state in (STATE_BREAK_TAKEN, STATE_ENFORCED_COOLDOWN):
+            self.break_start_time = current_time
+        elif state == STATE_COOLDOWN_ACTIVE:
+            self.cooldown_start_time = current_time
+
+        duration = self.state_duration(state)
+        if duration is None:
+            self.scheduler.cancel(TIMER_STATE)
+        else:
+            self.scheduler.at(TIMER_STATE, current_time + duration)
+
+        if state == STATE_NORMAL_PLAY and self.reminder_pending:
+            self.on_reminder_due(current_time)
+
+    def on_state_timeout(self, current_time):
+        state = self.current_state
+        if state == STATE_BREAK_REMINDER:
+            # The player ignored the break for too long
+            self.weekly_stats["breaks_ignored"] += 1
+            self.enter_state(STATE_ENFORCED_COOLDOWN, current_time)
+        elif state == STATE_BREAK_TAKEN:
+            self.end_break(current_time)
+        elif state == STATE_ENFORCED_COOLDOWN:
+            self.enter_state(STATE_COOLDOWN_ACTIVE, current_time)
+            # Ensure spaceship is in the sprite group after enforced cooldown
+            self.restore_spaceship()
+        elif state == STATE_COOLDOWN_ACTIVE:
+            # Only return to normal play after the full cooldown duration
+            self.enter_state(STATE_NORMAL_PLAY, current_time)
+
+    def restart_reminder(self, current_time):
+        """Count the time to the next break reminder from now (current_time)."""
+        self.last_break_reminder = current_time
+        self.reminder_pending = False
+        # Use dynamic timing if session data exists, otherwise the fixed default interval. This is
+        # a relative delay, so a restart while the game over screen has the scheduler paused
+        # waits the full time.
+        self.scheduler.schedule(TIMER_REMINDER, self.dynamic_break_threshold, pausable=True)
+
+    def on_reminder_due(self, current_time):
+        # Reminders only interrupt normal play after the countdown; otherwise wait for it
+        if self.current_state == STATE_NORMAL_PLAY and self.countdown == 0 and self.game_over == 0:
+            self.restart_reminder(current_time)
+            self.current_break_message = ""  # Reset message to get a new one
+            self.enter_state(STATE_BREAK_REMINDER, current_time)
+        else:
+            self.reminder_pending = True
+
+    def on_timer(self, name, current_time):
+        if name == TIMER_STATE:
+            self.on_state_timeout(current_time)
+        elif name == TIMER_REMINDER:
+            self.on_reminder_due(current_time)
+        elif name == TIMER_LEADERBOARD:
+            self.weekly_stats["last_leaderboard_check"] = current_time
+            self.save_leaderboard()
+            self.enter_state(STATE_LEADERBOARD_MINI, current_time)
+            self.schedule_weekly_leaderboard()
+        elif name == TIMER_HISTORY:
+            # Session history is kept in memory; the file is only re-read if its mtime changes
+            if self.break_policy.poll():
+                self.initialize_break_threshold()
+            self.scheduler.schedule(TIMER_HISTORY, self.break_policy.check_interval)
+
+    def update_break_state(self, frame_input, current_time):
+        # Voluntary break during cooldown
+        # P key for pause/break
+        if self.current_state == STATE_COOLDOWN_ACTIVE and frame_input.pause:
+            self.weekly_stats["breaks_taken"] += 1
+            self.enter_state(STATE_BREAK_TAKEN, current_time)
+
+        for name in self.scheduler.due(current_time):
+            self.on_timer(name, current_time)
+
+    def step(self, frame_input):
+        """Advance the simulation by one fixed tick."""
+        previous_state = self.current_state
+        previous_game_over = self.game_over
+        self.tick(frame_input)
+        if self.current_state != previous_state:
+            self.tracer.instant(self.current_state, "state", {"from": previous_state})
+        if self.game_over != previous_game_over:
+            self.tracer.instant("game_over" if self.game_over else "new_game", "state",
+                                {"game_over": self.game_over})
+        if self.level_up:
+            self.tracer.instant("level_up", "level", {"level": self.current_level})
+
+    def tick(self, frame_input):
+        self.level_up = False
+        self.alien_grid.reset_stats()
+        self.mask_tests = 0
+        if self.track_positions:
+            self.previous_positions = {sprite: sprite.rect.topleft
+                                       for group in self.moving_groups for sprite in group}
+
+        # Handle shooting on touch
+        for x, y in frame_input.taps:
+            self.spaceship.handle_touch(x, y)
+
+        for action in frame_input.actions:
+            self.apply_action(action)
+
+        # State transitions and the weekly leaderboard, for whichever timers are due
+        current_time = self.time()
+        started = self.profiler.start()
+        self.update_break_state(frame_input, current_time)
+        self.profiler.stop("break_state", started)
+
+        # Nothing to simulate on the mode selection and leaderboard screens
+        if not self.game_mode_selected or self.current_state == STATE_LEADERBOARD_MINI:
+            return
+
+        # Handle continuous touch movement
+        if frame_input.touch is not None:
+            self.spaceship.handle_touch(frame_input.touch[0], frame_input.touch[1])
+
+        if self.countdown == 0 and not self.level_transition:
+            # Create random alien bullets
+            time_now = self.ticks()
+
+            # Adjust alien shooting frequency based on state
+            current_alien_cooldown = self.alien_cooldown
+            if self.current_state == STATE_COOLDOWN_ACTIVE:
+                # Slower alien shooting during cooldown
+                current_alien_cooldown = self.alien_cooldown * self.tuning["cooldown_fire_slowdown"]
+
+            # Shoot
+            if (time_now - self.last_alien_shot > current_alien_cooldown
+                    and len(self.alien_bullet_group) < 5 and len(self.alien_group) > 0):
+                attacking_alien = self.random.choice(self.alien_group.sprites())
+                self.alien_bullet_pool.acquire(attacking_alien.rect.centerx,
+                                               attacking_alien.rect.bottom)
+                self.last_alien_shot = time_now
+
+            # Build the next wave while the last few aliens of this one are still alive, so
+            # clearing the level only has to swap it in
+            if 0 < len(self.alien_group) <= PREFETCH_AT_ALIENS and self.next_wave is None:
+                level = self.current_level + 1
+                self.next_wave = self.build_wave(level, self.prefetch_random(level))
+
+            # Check if all the aliens have been killed
+            if len(self.alien_group) == 0:
+                # Level completed
+                if self.current_level == self.max_level_reached:
+                    # Update max level reached if this is a new level
+                    self.max_level_reached += 1
+                    self.weekly_stats["max_level"] = self.max_level_reached
+
+                # Advance to next level
+                self.current_level += 1
+
+                # Put the next level's aliens in play, then pause while the level is announced
+                self.create_aliens()
+                self.level_up = True
+                self.level_up_until = self.ticks() + LEVEL_UP_MS
+
+                # Reset player position for new level
+                self.spaceship.rect.center = [int(screen_width / 2), screen_height - 100]
+                self.snap_position(self.spaceship)
+
+            if self.game_over == 0:
+                # Only update game elements if not in break reminder or break taken states
+                if self.current_state not in [STATE_BREAK_REMINDER, STATE_BREAK_TAKEN,
+                                              STATE_ENFORCED_COOLDOWN]:
+                    # Collision time is also counted separately, from inside the bullet updates
+                    started = self.profiler.start()
+
+                    # Update spaceship
+                    self.game_over = self.spaceship.update(frame_input)
+
+                    # Update sprite groups
+                    sync_started = self.profiler.start()
+                    self.alien_grid.sync(self.alien_group)
+                    self.profiler.stop("collisions", sync_started)
+                    self.bullet_group.update()
+                    self.formation.update()
+                    self.roaming_aliens.update()
+                    self.alien_bullet_group.update()
+                    self.profiler.stop("updates", started)
+            else:
+                # The reminder timer stands still until the next game starts
+                self.scheduler.pause()
+
+        if self.countdown > 0:
+            count_timer = self.ticks()
+            if count_timer - self.last_count > 1000:
+                self.countdown -= 1
+                self.last_count = count_timer
+                if self.countdown == 0:
+                    self.play_start_time = self.time()  # Reset play timer when game actually starts
+                    if self.first_game_start:  # Only reset break reminder timer on first game start
+                        self.restart_reminder(self.play_start_time)
+                        self.first_game_start = False
+                    elif self.reminder_pending:
+                        self.on_reminder_due(self.play_start_time)
+
+        # Update explosion group
+        self.explosion_group.update()
+
+    def pick_break_message(self):
+        # Set a new message if we don't have one
+        if not self.current_break_message:
+            self.current_break_message = self.message_random.choice(break_messages)
+        return self.current_break_message
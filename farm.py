@@ -0,0 +1,186 @@
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import statistics
+import multiprocessing
+
+# headless sets up the dummy SDL drivers before pygame is imported
+from headless import ScriptedPlayer, init_headless
+from settings import (fps, TUNING, MODE_BREAK_AWARE, STATE_BREAK_REMINDER, STATE_BREAK_TAKEN,
+                      STATE_ENFORCED_COOLDOWN, STATE_COOLDOWN_ACTIVE)
+from engine import GameEngine
+from clock import FrameClock
+
+RESULTS_FILE = "farm_results.jsonl"
+
+PAST_SESSIONS = 10  # Sessions of history_minutes recorded before each simulated session
+BREAK_CHOICES = {"take": "take_break", "ignore": "ignore_break", "none": None}
+COOLDOWN_STATES = (STATE_ENFORCED_COOLDOWN, STATE_COOLDOWN_ACTIVE)
+
+
+def simulate(job):
+    """Play one break-aware session with the scripted player and return what happened in it."""
+    clock = FrameClock()
+    game = GameEngine(persist=False, clock=clock, seed=job["seed"], tuning=job["tuning"])
+    if job["history_minutes"]:
+        # Past sessions of this length, so the threshold comes from break_ratio
+        for _ in range(PAST_SESSIONS):
+            game.break_policy.record(job["history_minutes"] * 60)
+        game.initialize_break_threshold()
+    game.select_mode(MODE_BREAK_AWARE)
+    player = ScriptedPlayer(BREAK_CHOICES[job["break_choice"]])
+
+    frames = int(job["minutes"] * 60 * fps)
+    entered = dict.fromkeys([STATE_BREAK_REMINDER, STATE_ENFORCED_COOLDOWN], 0)
+    cooldown_frames = break_frames = 0
+    state = game.current_state
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.step(player(game))
+        clock.advance()
+        if game.current_state != state:
+            state = game.current_state
+            if state in entered:
+                entered[state] += 1
+        if state in COOLDOWN_STATES:
+            cooldown_frames += 1
+        elif state == STATE_BREAK_TAKEN:
+            break_frames += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "reminders": entered[STATE_BREAK_REMINDER],
+        "enforced_breaks": entered[STATE_ENFORCED_COOLDOWN],
+        "cooldown_seconds": cooldown_frames / fps,
+        "break_seconds": break_frames / fps,
+        "max_level": game.max_level_reached,
+        "games_played": game.weekly_stats["games_played"],
+        "fps": frames / elapsed if elapsed else 0.0,
+    }
+
+
+def run_job(job):
+    return job, simulate(job)
+
+
+def make_jobs(sweep, break_choices, histories, seeds, minutes):
+    """One job per combination of swept values, break choice, history and seed."""
+    names = sorted(sweep)
+    jobs = []
+    for values in itertools.product(*(sweep[name] for name in names)):
+        tuning = dict(zip(names, values))
+        for break_choice, history_minutes, seed in itertools.product(break_choices, histories,
+                                                                     range(seeds)):
+            jobs.append({"tuning": tuning, "break_choice": break_choice,
+                         "history_minutes": history_minutes, "seed": seed, "minutes": minutes})
+    return jobs
+
+
+def run_farm(jobs, workers):
+    """Run every job, spread over a process pool, and return the (job, result) pairs."""
+    if workers == 1:
+        init_headless()
+        return [run_job(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with multiprocessing.Pool(workers, initializer=init_headless) as pool:
+        results = list(pool.imap_unordered(run_job, jobs, chunksize))
+        # Let the workers exit on their own: SDL catches the SIGTERM that terminate() sends
+        pool.close()
+        pool.join()
+    return results
+
+
+def aggregate(results):
+    """Average the sessions of each parameter combination over their seeds."""
+    groups = {}
+    for job, result in results:
+        params = [job["tuning"], job["break_choice"], job["history_minutes"]]
+        key = json.dumps(params, sort_keys=True)
+        groups.setdefault(key, (job, []))[1].append(result)
+
+    rows = []
+    for job, sessions in groups.values():
+        hours = job["minutes"] / 60 * len(sessions)
+        seconds = hours * 3600
+        params = dict(job["tuning"], break_choice=job["break_choice"],
+                      history_minutes=job["history_minutes"])
+        rows.append({
+            "params": params,
+            "sessions": len(sessions),
+            "reminders_per_hour": round(sum(s["reminders"] for s in sessions) / hours, 3),
+            "enforced_per_hour": round(sum(s["enforced_breaks"] for s in sessions) / hours, 3),
+            "cooldown_share": round(sum(s["cooldown_seconds"] for s in sessions) / seconds, 4),
+            "break_share": round(sum(s["break_seconds"] for s in sessions) / seconds, 4),
+            "mean_max_level": round(statistics.mean(s["max_level"] for s in sessions), 3),
+            "max_level": max(s["max_level"] for s in sessions),
+            "games_per_hour": round(sum(s["games_played"] for s in sessions) / hours, 3),
+            "fps": round(statistics.mean(s["fps"] for s in sessions)),
+        })
+    rows.sort(key=lambda row: json.dumps(row["params"], sort_keys=True))
+    return rows
+
+
+def parse_sweep(settings):
+    """Turn ["name=1,2", ...] into {"name": [1.0, 2.0], ...}."""
+    sweep = {}
+    for setting in settings:
+        name, _, values = setting.partition("=")
+        if name not in TUNING:
+            raise ValueError(f"unknown tuning value {name!r}; choose from {', '.join(TUNING)}")
+        sweep[name] = [float(value) for value in values.split(",")]
+    return sweep
+
+
+def print_rows(rows):
+    print(f"{'reminders/h':>12}{'cooldown':>10}{'level':>8}{'fps':>9}  params")
+    for row in rows:
+        params = " ".join(f"{name}={value}" for name, value in row["params"].items())
+        print(f"{row['reminders_per_hour']:>12.2f}{row['cooldown_share']:>10.1%}"
+              f"{row['mean_max_level']:>8.2f}{row['fps']:>9}  {params}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sweep break and difficulty tuning over many simulated sessions")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"values to sweep for one tuning setting ({', '.join(TUNING)})")
+    parser.add_argument("--break-choice", action="append", choices=sorted(BREAK_CHOICES),
+                        help="how the player answers reminders (default: take and none)")
+    parser.add_argument("--history", default="0", metavar="MINUTES,...",
+                        help="average length of past sessions; 0 for a first-time player "
+                             "(default %(default)s)")
+    parser.add_argument("--seeds", type=int, default=10, help="sessions per parameter combination")
+    parser.add_argument("--minutes", type=float, default=20, help="simulated minutes per session")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes to run sessions in")
+    parser.add_argument("--out", default=RESULTS_FILE,
+                        help="aggregated results, one JSON line per combination")
+    args = parser.parse_args(argv)
+
+    try:
+        sweep = parse_sweep(args.set)
+    except ValueError as e:
+        parser.error(str(e))
+    histories = [float(value) for value in args.history.split(",")]
+    break_choices = args.break_choice or ["take", "none"]
+    jobs = make_jobs(sweep, break_choices, histories, args.seeds, args.minutes)
+    print(f"Running {len(jobs)} sessions of {args.minutes:g} simulated minutes "
+          f"on {args.workers} processes")
+
+    start = time.perf_counter()
+    rows = aggregate(run_farm(jobs, args.workers))
+    elapsed = time.perf_counter() - start
+    print_rows(rows)
+    with open(args.out, "w") as f:
+        f.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+    simulated_hours = len(jobs) * args.minutes / 60
+    print(f"{simulated_hours:.1f} simulated hours in {elapsed:.1f} s; "
+          f"wrote {len(rows)} rows to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
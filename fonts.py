@@ -0,0 +1,33 @@
+import pygame
+
+# Font files by face; None is the font built into pygame (FreeSans Bold), which is the same on
+# the desktop and in the browser, unlike whatever SysFont finds (or falls back from) on each system
+FONT_FILES = {
+    "sans": None,
+}
+DEFAULT_FACE = "sans"
+
+# Shared Font objects and measured text sizes
+fonts = {}  # (face, size) -> Font
+text_sizes = {}  # (Font, text) -> (width, height)
+
+
+def font(size, face=DEFAULT_FACE):
+    """Return the Font for a face and size, opened once and shared afterwards."""
+    key = (face, size)
+    if key not in fonts:
+        fonts[key] = pygame.font.Font(FONT_FILES[face], size)
+    return fonts[key]
+
+
+def text_size(font, text):
+    """Return font.size(text), measured once per font and string."""
+    key = (font, text)
+    size = text_sizes.get(key)
+    if size is None:
+        size = text_sizes[key] = font.size(text)
+    return size
+
+
+def text_width(font, text):
+    return text_size(font, text)[0]
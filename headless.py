@@ -0,0 +1,163 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Run without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import assets
+from settings import (fps, screen_width, screen_height, MODE_NORMAL, MODE_BREAK_AWARE,
+                      STATE_BREAK_REMINDER, BW_AUTO)
+from engine import GameEngine, FrameInput
+from clock import FrameClock
+from replay import InputRecorder, ReplayPlayer, load_replay, replay_game, outcome
+
+
+# Simple computer player used when nobody is at the keyboard
+class ScriptedPlayer:
+    def __init__(self, break_choice="take_break"):
+        # What to do when a break reminder appears: "take_break", "ignore_break", or None to
+        # leave it on screen until the enforced break starts
+        self.break_choice = break_choice
+
+    def __call__(self, game):
+        actions = []
+        if game.game_over != 0:
+            actions.append("new_game")
+        if game.current_state == STATE_BREAK_REMINDER and self.break_choice:
+            actions.append(self.break_choice)
+
+        # Move under the nearest alien and keep firing
+        left = right = False
+        ship_x = game.spaceship.rect.centerx
+        if game.alien_group:
+            target = min(game.alien_group, key=lambda alien: abs(alien.rect.centerx - ship_x))
+            left = target.rect.centerx < ship_x - 4
+            right = target.rect.centerx > ship_x + 4
+        return FrameInput(left=left, right=right, fire=True, actions=actions)
+
+
+def init_headless(render=False, bw_mode=BW_AUTO):
+    """Initialise pygame for a window-less run and load the shared assets."""
+    pygame.init()
+    screen = None
+    if render:
+        # The dummy driver still gives us a real surface to draw on
+        screen = pygame.display.set_mode((screen_width, screen_height))
+    assets.load_assets(bw_mode)
+    return screen
+
+
+def run(frames, seed=None, mode=MODE_NORMAL, player=None, render=False, replay=None,
+        recorder_path=None):
+    """Step the game for a number of frames as fast as possible and return run statistics.
+
+    With a replay, its recorded inputs drive the game instead of player and frames is ignored;
+    with recorder_path, the inputs of this run are saved there as a replay.
+    """
+    screen = init_headless(render)
+    renderer = None
+    if render:
+        import render as render_module
+        renderer = render_module.Renderer(screen)
+        renders_before = render_module.font_render_count
+
+    recorder = None
+    if replay:
+        game, clock = replay_game(replay)
+        player = ReplayPlayer(replay)
+        frames = replay["frames"]
+    else:
+        if recorder_path and seed is None:
+            seed = random.randrange(2 ** 32)  # A recording needs a concrete seed to replay
+        player = player or ScriptedPlayer()
+        clock = FrameClock()
+        game = GameEngine(persist=False, clock=clock, seed=seed)
+        game.select_mode(mode)
+        if recorder_path:
+            recorder = InputRecorder(seed, clock, mode)
+
+    step_time = 0.0
+    collision_tests = 0
+    linear_tests = 0
+    mask_tests = 0
+    start = time.perf_counter()
+    frame = 0
+    while frame < frames and game.running:
+        frame_input = player(game)
+        if frame_input is None:
+            break
+        if recorder:
+            recorder.record(frame_input)
+        step_start = time.perf_counter()
+        game.step(frame_input)
+        step_time += time.perf_counter() - step_start
+        collision_tests += game.alien_grid.tests
+        linear_tests += game.alien_grid.linear_tests
+        mask_tests += game.mask_tests
+        clock.advance()
+        if renderer:
+            renderer.draw(game, (0, 0))
+        frame += 1
+    elapsed = time.perf_counter() - start
+    if recorder:
+        recorder.save(recorder_path, game)
+
+    result = {
+        "frames": frame,
+        "seconds": elapsed,
+        "fps": frame / elapsed if elapsed else 0.0,
+        "mean_step_ms": step_time / frame * 1000 if frame else 0.0,
+        # Bullet-vs-alien rect tests per frame, and what a full scan of alien_group would cost
+        "collision_tests_per_frame": collision_tests / frame if frame else 0.0,
+        "linear_tests_per_frame": linear_tests / frame if frame else 0.0,
+        # Pixel-mask tests, run only for alien bullets whose rect overlaps the spaceship
+        "mask_tests_per_frame": mask_tests / frame if frame else 0.0,
+        "bullet_pool": game.bullet_pool.stats(),
+        "alien_bullet_pool": game.alien_bullet_pool.stats(),
+        "explosion_pool": game.explosion_pool.stats(),
+        "level": game.current_level,
+        "score": game.score,
+        "games_played": game.weekly_stats["games_played"],
+        "breaks_taken": game.weekly_stats["breaks_taken"],
+        "breaks_ignored": game.weekly_stats["breaks_ignored"],
+    }
+    if replay:
+        result["matches_recording"] = outcome(game) == replay["outcome"]
+    if renderer:
+        renders = render_module.font_render_count - renders_before
+        result["font_renders_per_frame"] = renders / frame if frame else 0.0
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game simulation without a window")
+    parser.add_argument("--frames", type=int, default=3600, help="number of frames to simulate")
+    parser.add_argument("--minutes", type=float,
+                        help="simulated minutes of play to run instead of --frames")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--mode", choices=[MODE_NORMAL, MODE_BREAK_AWARE], default=MODE_NORMAL)
+    parser.add_argument("--render", action="store_true",
+                        help="also draw every frame to an off-screen surface")
+    parser.add_argument("--record", metavar="FILE",
+                        help="save this run's seed and inputs as a replay")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="re-run a recorded replay and check it ends the same way")
+    args = parser.parse_args(argv)
+
+    replay = load_replay(args.replay) if args.replay else None
+    frames = int(args.minutes * 60 * fps) if args.minutes else args.frames
+    result = run(frames, seed=args.seed, mode=args.mode, render=args.render, replay=replay,
+                 recorder_path=args.record)
+    for key, value in result.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+    pygame.quit()
+    return 0 if result.get("matches_recording", True) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
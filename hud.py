@@ -0,0 +1,80 @@
+import pygame
+
+# Characters that can appear in a HUD value; each one is rendered once per font and colour
+GLYPH_CHARS = "0123456789/-"
+
+
+# Pre-rendered digits for one font and colour, so numbers can be composed without font.render
+class GlyphStrip:
+    def __init__(self, render, font, color):
+        self.glyphs = {char: render(char, font, color) for char in GLYPH_CHARS}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def width(self, text):
+        return sum(self.glyphs[char].get_width() for char in text)
+
+    def blit(self, surface, text, x, y):
+        for char in text:
+            glyph = self.glyphs[char]
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+
+# One "LABEL: value" entry, re-composed only when its value changes
+class HudField:
+    def __init__(self, render, font, color, label, pos, glyphs):
+        self.label = render(label, font, color)
+        self.pos = pos
+        self.glyphs = glyphs
+        self.value = None
+        self.surface = None
+
+    def set(self, value):
+        text = str(value)
+        if text == self.value:
+            return
+        self.value = text
+        label_width = self.label.get_width()
+        height = max(self.label.get_height(), self.glyphs.height)
+        width = label_width + self.glyphs.width(text)
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.surface.blit(self.label, (0, 0))
+        self.glyphs.blit(self.surface, text, label_width, 0)
+
+    def draw(self, screen):
+        return screen.blit(self.surface, self.pos)
+
+
+# Score, lives and progression display built from cached surfaces
+class Hud:
+    def __init__(self, render, font30, font20, white, yellow, screen_width):
+        white30 = GlyphStrip(render, font30, white)
+        yellow30 = GlyphStrip(render, font30, yellow)
+        white20 = GlyphStrip(render, font20, white)
+
+        self.score = HudField(render, font30, white, "SCORE: ", (10, 30), white30)
+        self.lives = HudField(render, font30, white, "LIVES: ", (10, 70), white30)
+        self.level = HudField(render, font30, yellow, "LEVEL: ", (screen_width - 150, 30), yellow30)
+        self.max_level = HudField(render, font20, white, "MAX LEVEL: ", (screen_width - 150, 60),
+                                  white20)
+        self.aliens = HudField(render, font20, white, "Aliens: ", (screen_width - 150, 90), white20)
+
+    def draw(self, screen, game):
+        """Blit the HUD for the current game state and return the rects drawn."""
+        rects = []
+        # Draw score and progression first (they should remain in color)
+        if not game.hide_score:
+            self.score.set(game.score)
+            rects.append(self.score.draw(screen))
+        if not game.hide_progression:
+            self.level.set(game.current_level)
+            self.max_level.set(game.max_level_reached)
+            self.aliens.set(f"{len(game.alien_group)}/{game.rows * game.cols}")
+            rects.append(self.level.draw(screen))
+            rects.append(self.max_level.draw(screen))
+            rects.append(self.aliens.draw(screen))
+
+        # Draw lives
+        self.lives.set(game.spaceship.health_remaining)
+        rects.append(self.lives.draw(screen))
+        return rects
@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import queue
+import threading
+
+
+def atomic_write_json(path, data, **dump_args):
+    """Write JSON to a temporary file and rename it over path, so readers never see half a file."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, **dump_args)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+# Write-behind persistence: the game thread queues writes and a worker thread does the file I/O.
+# Whole-file writes are coalesced by path, so a burst of leaderboard saves costs one write.
+class PersistenceWorker:
+    def __init__(self, max_queue=32, threaded=True, tracer=None):
+        self.queue = queue.Queue(max_queue)
+        self.tracer = tracer  # Optional Tracer that gets a span per write
+        self.lock = threading.Lock()
+        self.latest = {}  # path -> (data, dump_args, submit time) for the newest pending snapshot
+        self.errors = []
+
+        # Statistics
+        self.submitted = 0
+        self.coalesced = 0
+        self.writes = 0
+        self.blocked = 0  # submits that had to wait because the queue was full
+        self.max_depth = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+        self.thread = None
+        if threaded:
+            self.thread = threading.Thread(target=self.run, name="persistence", daemon=True)
+            self.thread.start()
+
+    def write_json(self, path, data, **dump_args):
+        """Queue a whole-file write; data must be a snapshot the caller will not mutate."""
+        submitted = time.perf_counter()
+        with self.lock:
+            self.submitted += 1
+            pending = path in self.latest
+            self.latest[path] = (data, dump_args, submitted)
+            if pending:
+                self.coalesced += 1
+        if pending:
+            # The queued job for this path will pick up the newer data
+            return
+        self.enqueue(("write", path))
+
+    def call(self, func, *args, **kwargs):
+        """Queue an arbitrary write such as a log append; these are never coalesced."""
+        with self.lock:
+            self.submitted += 1
+        self.enqueue(("call", (func, args, kwargs, time.perf_counter())))
+
+    def enqueue(self, job):
+        if self.thread is None:
+            self.do_job(job)
+            return
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            # Never drop saved data, and keep appends in order: wait for room
+            self.blocked += 1
+            self.queue.put(job)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def run(self):
+        if self.tracer:
+            self.tracer.name_thread("persistence")
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                self.do_job(job)
+            finally:
+                self.queue.task_done()
+
+    def do_job(self, job):
+        kind, payload = job
+        started = time.perf_counter()
+        try:
+            if kind == "write":
+                name = payload
+                with self.lock:
+                    data, dump_args, submitted = self.latest.pop(payload)
+                atomic_write_json(payload, data, **dump_args)
+            else:
+                func, args, kwargs, submitted = payload
+                name = func.__name__
+                func(*args, **kwargs)
+        except Exception as e:
+            self.errors.append(e)
+            return
+        if self.tracer:
+            self.tracer.complete(name, "persistence", started)
+        latency = time.perf_counter() - submitted
+        with self.lock:
+            self.writes += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def depth(self):
+        return self.queue.qsize()
+
+    def flush(self, timeout=None):
+        """Wait until every queued write is done; returns False if the timeout ran out first."""
+        if self.thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self, timeout=2.0):
+        """Flush pending writes and stop the worker thread."""
+        done = self.flush(timeout)
+        if self.thread is not None and done:
+            self.queue.put(None)
+            self.thread.join(timeout)
+        return done
+
+    def stats(self):
+        return {
+            "queue_depth": self.depth(),
+            "max_queue_depth": self.max_depth,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "writes": self.writes,
+            "blocked": self.blocked,
+            "errors": len(self.errors),
+            "mean_latency_ms": self.total_latency / self.writes * 1000 if self.writes else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
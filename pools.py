@@ -0,0 +1,90 @@
+import pygame
+
+# What a pool does when every sprite it may keep is already in play
+OVERFLOW_GROW = "grow"  # build a new sprite anyway (counted as a miss, discarded when released)
+OVERFLOW_DROP = "drop"  # refuse the request; acquire() returns None
+OVERFLOW_RECYCLE = "recycle"  # take over the oldest sprite still in play
+
+
+# Sprite that goes back to its pool when it is killed
+class PooledSprite(pygame.sprite.Sprite):
+    pool = None
+
+    def kill(self):
+        was_alive = self.alive()
+        pygame.sprite.Sprite.kill(self)
+        # Sprites often call kill() twice in one update; only the first one releases
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+
+# Fixed-capacity pool of recycled sprites for one sprite group
+class SpritePool:
+    def __init__(self, factory, group, capacity, overflow=OVERFLOW_GROW, prefill_args=None):
+        # factory(*args) builds a new sprite; sprite.reset(*args) re-initialises a recycled one
+        self.factory = factory
+        self.group = group
+        self.capacity = capacity
+        self.overflow = overflow
+        self.free = []
+        self.live = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.high_water = 0
+        self.dropped = 0
+        self.recycled = 0
+
+        if prefill_args is not None:
+            self.prefill(*prefill_args)
+
+    def prefill(self, *args):
+        """Build every sprite up front so gameplay never allocates one."""
+        while len(self.free) < self.capacity:
+            sprite = self.factory(*args)
+            sprite.pool = self
+            self.free.append(sprite)
+
+    def acquire(self, *args):
+        """Return a sprite reset with args and added to the group, or None if dropped."""
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.hits += 1
+        elif self.live >= self.capacity and self.overflow == OVERFLOW_DROP:
+            self.dropped += 1
+            return None
+        elif self.live >= self.capacity and self.overflow == OVERFLOW_RECYCLE and self.group:
+            # Group keeps insertion order, so the first sprite is the oldest
+            next(iter(self.group)).kill()
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.recycled += 1
+        else:
+            sprite = self.factory(*args)
+            sprite.pool = self
+            self.misses += 1
+        self.live += 1
+        self.high_water = max(self.high_water, self.live)
+        self.group.add(sprite)
+        return sprite
+
+    def release(self, sprite):
+        self.live -= 1
+        if len(self.free) < self.capacity:
+            self.free.append(sprite)
+
+    def clear(self):
+        """Return every sprite in the group to the pool."""
+        for sprite in self.group.sprites():
+            sprite.kill()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+            "recycled": self.recycled,
+        }
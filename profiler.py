@@ -0,0 +1,53 @@
+import time
+from collections import deque
+
+# Main-loop phases, in the order the debug overlay lists them
+PHASES = ["events", "break_state", "updates", "collisions", "draw", "overlays", "display"]
+
+# Phases timed once per bullet; a trace gets their per-frame total instead of every call
+SUMMED_PHASES = ["collisions"]
+
+
+# Per-phase frame timings for the debug overlay and the trace file. While neither is on,
+# start() and stop() return straight away, so the calls can stay in the game loop permanently.
+class PhaseTimer:
+    def __init__(self, history=120):
+        self.enabled = False  # Debug overlay showing
+        self.tracer = None  # Tracer that also gets every phase as a span
+        self.active = False
+        self.current = dict.fromkeys(PHASES, 0.0)  # seconds spent so far this frame
+        self.last = dict.fromkeys(PHASES, 0.0)  # the last completed frame
+        self.frame_times = deque(maxlen=history)  # seconds of work per frame, newest last
+
+    def start(self):
+        return time.perf_counter() if self.active else 0.0
+
+    def stop(self, phase, started):
+        # started is 0.0 when timing was switched on part-way through the phase
+        if not self.active or not started:
+            return
+        ended = time.perf_counter()
+        self.current[phase] += ended - started
+        if self.tracer and phase not in SUMMED_PHASES:
+            self.tracer.complete(phase, "loop", started, ended)
+
+    def end_frame(self, frame_seconds):
+        """Close the current frame; phases can run several times a frame and are summed."""
+        if not self.active:
+            return
+        if self.tracer:
+            for phase in SUMMED_PHASES:
+                self.tracer.counter(f"{phase}_ms", {"ms": self.current[phase] * 1000})
+        self.last = self.current
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_times.append(frame_seconds)
+
+    def set_tracer(self, tracer):
+        self.tracer = tracer
+        self.active = self.enabled or tracer is not None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.active = self.enabled or self.tracer is not None
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_times.clear()
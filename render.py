@@ -0,0 +1,648 @@
+import pygame
+import assets
+import fonts
+from hud import Hud
+from profiler import PHASES
+from settings import (BW_AUTO, BW_POSTPROCESS, screen_width, screen_height, STATE_BREAK_REMINDER,
+                      STATE_BREAK_TAKEN, STATE_COOLDOWN_ACTIVE, STATE_ENFORCED_COOLDOWN,
+                      STATE_LEADERBOARD_MINI, red, green, white, blue, light_blue, yellow)
+
+# NumPy is only needed for the per-frame black and white post-process
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Cooldown overlay lines, and the volume line shown between the first and second of them
+COOLDOWN_TEXT = ["Cooldown Mode Activated", "Take a break to restore full sound",
+                 "Press P to voluntarily take a break"]
+VOLUME_TEXT = "Volume: {}%"
+
+# Number of font.render calls and blits so far, read by the benchmark, the headless runner
+# and the debug overlay
+font_render_count = 0
+blit_count = 0
+
+
+def render_text(text, font, color):
+    global font_render_count
+    font_render_count += 1
+    return font.render(text, True, color)
+
+
+def count_blits(count=1):
+    global blit_count
+    blit_count += count
+
+
+def grayscale_in_place(surface):
+    """Desaturate a whole surface, keeping any per-pixel alpha."""
+    if numpy is None:
+        gray = pygame.transform.grayscale(surface)
+        surface.fill((0, 0, 0, 0))
+        # Plain copy, alpha included
+        surface.blit(gray, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        return
+    pixels = pygame.surfarray.pixels3d(surface)
+    rgb = pixels.astype(numpy.uint16)
+    # Same integer luma weights pygame.transform.grayscale uses
+    pixels[...] = ((rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8)[..., None]
+    del pixels  # Unlocks the surface
+
+
+# Create Button class for UI
+class Button:
+    def __init__(self, x, y, width, height, text, color, hover_color):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = text
+        self.color = color
+        self.hover_color = hover_color
+        self.hovered = False
+        self.label_cache = {}
+
+    def draw(self, screen, font):
+        color = self.hover_color if self.hovered else self.color
+        pygame.draw.rect(screen, color, self.rect, border_radius=10)
+        pygame.draw.rect(screen, white, self.rect, 2, border_radius=10)  # Border
+
+        # The label never changes, so render it once per font
+        if font not in self.label_cache:
+            self.label_cache[font] = render_text(self.text, font, white)
+        text_surf = self.label_cache[font]
+        text_rect = text_surf.get_rect(center=self.rect.center)
+        screen.blit(text_surf, text_rect)
+        count_blits()
+
+    def check_hover(self, pos):
+        self.hovered = self.rect.collidepoint(pos)
+        return self.hovered
+
+    def check_click(self, pos, click):
+        return self.rect.collidepoint(pos) and click
+
+
+# Draws the game engine's state onto the screen
+class Renderer:
+    def __init__(self, screen, cached_hud=True, bw_mode=BW_AUTO):
+        self.screen = screen
+        # Desaturate a layer of colour sprites each frame instead of blitting the black and white
+        # sprite images; the background stays in colour, as in the other modes
+        self.bw_postprocess = bw_mode == BW_POSTPROCESS
+        self.sprite_layer = None
+        if self.bw_postprocess:
+            self.sprite_layer = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+
+        # Define fonts
+        self.font30 = fonts.font(30)
+        self.font40 = fonts.font(40)
+        self.font20 = fonts.font(20)
+
+        # Score, lives and progression text, re-rendered only when a value changes
+        self.hud = None
+        if cached_hud:
+            self.hud = Hud(render_text, self.font30, self.font20, white, yellow, screen_width)
+
+        # Interpolation factor for the frame being drawn (1.0 = latest tick)
+        self.alpha = 1.0
+
+        # Create cached overlay surfaces
+        self.break_overlay = self.make_overlay((0, 0, 0, 180))  # Semi-transparent black
+        self.break_screen_overlay = self.make_overlay((0, 0, 100, 180))  # Semi-transparent blue
+        self.enforced_overlay = self.make_overlay((200, 0, 0, 180))  # Semi-transparent red
+        self.leaderboard_overlay = self.make_overlay((0, 0, 0, 220))  # Semi-transparent black
+        # Darker semi-transparent black for better contrast
+        self.game_over_overlay = self.make_overlay((0, 0, 0, 200))
+
+        # Cache for rendered text surfaces
+        self.text_cache = {}
+        self.message_cache = {}
+        for text in COOLDOWN_TEXT:
+            self.get_cached_text(text, self.font20, red)
+        # Cooldown volume line, re-rendered only when the percentage changes
+        self.volume_value = None
+        self.volume_surface = None
+
+        # Every button is 300x50 and centred horizontally
+        x, y = screen_width//2 - 150, screen_height//2
+
+        # Create mode selection buttons
+        self.normal_button = Button(x, y, 300, 50, "Normal Mode", green, (0, 200, 0))
+        self.break_aware_button = Button(x, y + 70, 300, 50, "Break-Aware Mode", blue, light_blue)
+
+        # Create break reminder buttons
+        self.take_break_button = Button(x, y, 300, 50, "Take a Break", green, (0, 200, 0))
+        self.ignore_break_button = Button(x, y + 70, 300, 50, "Continue Playing", red, (200, 0, 0))
+
+        # Create resume button for after break
+        self.resume_button = Button(x, y + 70, 300, 50, "Resume Game", green, (0, 200, 0))
+
+        # Create end of session buttons
+        self.new_game_button = Button(x, y + 50, 300, 50, "Return", green, (0, 200, 0))
+        self.quit_button = Button(x, y + 120, 300, 50, "Quit", red, (200, 0, 0))
+
+    @property
+    def bg(self):
+        # Looked up when first drawn, so the mode selection screen can show before assets are loaded
+        return assets.image("bg")
+
+    def invalidate(self):
+        """Something was drawn over the frame outside draw(); the next frame must repaint it."""
+
+    @staticmethod
+    def make_overlay(color):
+        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+        overlay.fill(color)
+        return overlay
+
+    def get_cached_text(self, text, font, color):
+        key = (text, font, color)
+        if key not in self.text_cache:
+            self.text_cache[key] = render_text(text, font, color)
+        return self.text_cache[key]
+
+    def get_cached_message(self, message):
+        if message not in self.message_cache:
+            # Split message into lines
+            words = message.split()
+            lines = []
+            current_line = ""
+
+            for word in words:
+                test_line = current_line + " " + word if current_line else word
+                if fonts.text_width(self.font20, test_line) < screen_width - 100:
+                    current_line = test_line
+                else:
+                    lines.append(current_line)
+                    current_line = word
+            if current_line:
+                lines.append(current_line)
+
+            # Cache the lines
+            self.message_cache[message] = lines
+        return self.message_cache[message]
+
+    def premeasure(self, messages):
+        """Lay out break messages ahead of time, so showing a reminder doesn't measure any text."""
+        for message in messages:
+            self.get_cached_message(message)
+
+    def blit(self, surface, dest, area=None):
+        count_blits()
+        return self.screen.blit(surface, dest, area)
+
+    def draw_bg(self):
+        self.blit(self.bg, (0, 0))
+
+    # Define function for creating text
+    def draw_text(self, text, font, text_col, x, y):
+        img = render_text(text, font, text_col)
+        return self.blit(img, (x, y))
+
+    def visible_buttons(self, game):
+        """Buttons the player can click right now, with the action each one triggers."""
+        if not game.game_mode_selected:
+            return self.mode_buttons()
+        buttons = []
+        if game.current_state != STATE_LEADERBOARD_MINI:
+            if game.game_over != 0:
+                buttons.append((self.new_game_button, "new_game"))
+                buttons.append((self.quit_button, "quit"))
+            if game.current_state == STATE_BREAK_REMINDER:
+                buttons.append((self.take_break_button, "take_break"))
+                buttons.append((self.ignore_break_button, "ignore_break"))
+        return buttons
+
+    def mode_buttons(self):
+        return [(self.normal_button, "mode_normal"), (self.break_aware_button, "mode_break_aware")]
+
+    def clicked_actions(self, game, pos):
+        """Actions for every visible button under a click."""
+        return [action for button, action in self.visible_buttons(game)
+                if button.check_click(pos, True)]
+
+    def draw(self, game, mouse_pos, alpha=1.0):
+        """Draw a complete frame.
+
+        alpha is how far the frame falls between the previous tick and the latest one; moving
+        sprites are drawn that far along. Returns the list of screen areas to flip, or None when
+        the whole screen must be updated.
+        """
+        self.alpha = alpha
+        # Check button hovers
+        for button, action in self.visible_buttons(game):
+            button.check_hover(mouse_pos)
+
+        # Mode selection screen
+        if not game.game_mode_selected:
+            self.draw_mode_selection()
+            return
+
+        if game.current_state == STATE_LEADERBOARD_MINI:
+            self.draw_leaderboard(game)
+            return
+
+        self.draw_playfield(game)
+
+        started = game.profiler.start()
+        if game.countdown > 0:
+            self.draw_text('GET READY!', self.font40, white,
+                           int(screen_width / 2 - 110), int(screen_height / 2 + 50))
+            self.draw_text(str(game.countdown), self.font40, white,
+                           int(screen_width / 2 - 10), int(screen_height / 2 + 100))
+        if game.level_transition:
+            self.draw_level_up(game)
+
+        # Draw game over messages if needed
+        if game.game_over != 0:
+            self.draw_game_over(game)
+
+        # Draw state-specific overlays last to ensure they stay on top
+        if game.current_state == STATE_BREAK_REMINDER:
+            self.draw_break_reminder(game)
+        elif game.current_state == STATE_COOLDOWN_ACTIVE:
+            # Draw cooldown overlay last to ensure it stays on top
+            self.draw_cooldown_overlay(game)
+        elif game.current_state == STATE_ENFORCED_COOLDOWN:
+            self.draw_enforced_cooldown(game)
+        elif game.current_state == STATE_BREAK_TAKEN:
+            self.draw_break_screen(game)
+        game.profiler.stop("overlays", started)
+
+    def draw_hud(self, game):
+        """Draw score, progression and lives, returning the rects drawn."""
+        if self.hud:
+            rects = self.hud.draw(self.screen, game)
+            count_blits(len(rects))
+            return rects
+
+        rects = []
+        # Draw score and progression first (they should remain in color)
+        if not game.hide_score:
+            rects.append(self.draw_text(f"SCORE: {game.score}", self.font30, white, 10, 30))
+        if not game.hide_progression:
+            rects.extend(self.draw_progression_info(game))
+
+        # Draw lives
+        rects.append(self.draw_text(f"LIVES: {game.spaceship.health_remaining}", self.font30, white,
+                                    10, 70))
+        return rects
+
+    def sprite_rect(self, game, sprite):
+        """Where to draw a sprite, interpolated between its last two tick positions."""
+        previous = game.previous_positions.get(sprite)
+        if previous is None or self.alpha >= 1.0:
+            return sprite.rect
+        x, y = sprite.rect.topleft
+        return sprite.rect.move(round((previous[0] - x) * (1.0 - self.alpha)),
+                                round((previous[1] - y) * (1.0 - self.alpha)))
+
+    def draw_health_bar(self, game):
+        spaceship = game.spaceship
+        if not spaceship.alive() or spaceship.health_remaining <= 0:
+            return []
+        ship_rect = self.sprite_rect(game, spaceship)
+        bar = pygame.Rect(ship_rect.x, ship_rect.bottom + 10, ship_rect.width, 15)
+        pygame.draw.rect(self.screen, red, bar)
+        health = spaceship.health_remaining / spaceship.health_start
+        pygame.draw.rect(self.screen, green, (bar.x, bar.y, int(bar.width * health), 15))
+        return [bar]
+
+    def black_and_white(self, game):
+        # Only apply black and white during normal play
+        return game.black_and_white and game.game_over == 0
+
+    def draw_sprites(self, game, bw=None, target=None):
+        """Blit every sprite onto target (the screen by default) and return the rects they cover."""
+        groups = game.moving_groups
+        if bw is None:
+            bw = self.black_and_white(game)
+        if game.previous_positions and self.alpha < 1.0:
+            position = lambda sprite: self.sprite_rect(game, sprite)
+        else:
+            position = lambda sprite: sprite.rect
+        if bw:
+            # Draw game elements with black and white images
+            blit_list = [(sprite.bw_image, position(sprite))
+                         for group in groups for sprite in group]
+            blit_list += [(sprite.bw_images[sprite.index], sprite.rect)
+                          for sprite in game.explosion_group]
+        else:
+            blit_list = [(sprite.image, position(sprite)) for group in groups for sprite in group]
+            blit_list += [(sprite.image, sprite.rect) for sprite in game.explosion_group]
+        count_blits(len(blit_list))
+        return (target or self.screen).blits(blit_list)
+
+    def draw_playfield(self, game):
+        self.draw_bg()
+        if self.bw_postprocess and self.black_and_white(game):
+            # Colour sprites on their own layer, then one pass over it; the background, HUD and
+            # health bar stay in colour
+            self.sprite_layer.fill((0, 0, 0, 0))
+            self.draw_sprites(game, bw=False, target=self.sprite_layer)
+            grayscale_in_place(self.sprite_layer)
+            self.blit(self.sprite_layer, (0, 0))
+            self.draw_hud(game)
+            self.draw_health_bar(game)
+            return
+        self.draw_hud(game)
+        self.draw_health_bar(game)
+        self.draw_sprites(game)
+
+    # Draw level and progression info
+    def draw_progression_info(self, game):
+        # Draw level info at top right
+        level_text = f"LEVEL: {game.current_level}"
+        level_rect = self.draw_text(level_text, self.font30, yellow, screen_width - 150, 30)
+
+        # Draw max level reached
+        max_level_text = f"MAX LEVEL: {game.max_level_reached}"
+        max_level_rect = self.draw_text(max_level_text, self.font20, white, screen_width - 150, 60)
+
+        # Draw aliens remaining
+        aliens_text = f"Aliens: {len(game.alien_group)}/{game.rows*game.cols}"
+        aliens_rect = self.draw_text(aliens_text, self.font20, white, screen_width - 150, 90)
+        return [level_rect, max_level_rect, aliens_rect]
+
+    def draw_level_up(self, game):
+        # Display level up message
+        level_up_message = f"LEVEL {game.current_level}!"
+        self.draw_text(level_up_message, self.font40, yellow,
+                       int(screen_width / 2 - 100), int(screen_height / 2))
+
+    def draw_game_over(self, game):
+        # Draw more prominent end of session overlay
+        self.blit(self.game_over_overlay, (0, 0))
+
+        # Draw a highlighted box for the end session message
+        message_box = pygame.Rect(screen_width//2 - 200, screen_height//2 - 150, 400, 300)
+        pygame.draw.rect(self.screen, (50, 50, 50), message_box)
+        pygame.draw.rect(self.screen, yellow, message_box, 3)  # Yellow border
+
+        if game.game_over == -1:
+            self.draw_text('GAME OVER!', self.font40, red,
+                           int(screen_width / 2 - 120), int(screen_height / 2 - 120))
+        if game.game_over == 1:
+            self.draw_text('YOU WIN!', self.font40, green,
+                           int(screen_width / 2 - 100), int(screen_height / 2 - 120))
+
+        # Display score with more prominence
+        self.draw_text(f'Final Score: {game.score}', self.font30, yellow,
+                       int(screen_width / 2 - 100), int(screen_height / 2 - 50))
+
+        # Add instruction text
+        self.draw_text('Choose an option:', self.font30, white,
+                       int(screen_width / 2 - 120), int(screen_height / 2))
+
+        # Draw end of session buttons
+        self.new_game_button.draw(self.screen, self.font30)
+        self.quit_button.draw(self.screen, self.font30)
+
+    # Draw break reminder overlay
+    def draw_break_reminder(self, game):
+        # Use cached overlay
+        self.blit(self.break_overlay, (0, 0))
+
+        # Break reminder text
+        title_text = "Time for a Break!"
+        title_surface = self.get_cached_text(title_text, self.font40, white)
+        title_width = title_surface.get_width()
+        self.blit(title_surface, ((screen_width - title_width) // 2, screen_height//2 - 120))
+
+        # Split message into lines
+        lines = self.get_cached_message(game.pick_break_message())
+
+        # Draw each line of the message centered
+        y_pos = screen_height//2 - 50
+        for line in lines:
+            line_surface = self.get_cached_text(line, self.font20, white)
+            line_width = line_surface.get_width()
+            self.blit(line_surface, ((screen_width - line_width) // 2, y_pos))
+            y_pos += 30
+
+        # Draw buttons with proper spacing
+        button_y = screen_height//2 + 50
+        self.take_break_button.rect.y = button_y
+        self.ignore_break_button.rect.y = button_y + 70
+
+        self.take_break_button.draw(self.screen, self.font30)
+        self.ignore_break_button.draw(self.screen, self.font30)
+
+    # Draw break screen
+    def draw_break_screen(self, game):
+        # Semi-transparent overlay
+        self.blit(self.break_screen_overlay, (0, 0))
+
+        # Break text
+        self.draw_text("Taking a Break", self.font40, white,
+                       screen_width//2 - 130, screen_height//2 - 100)
+
+        # Countdown timer
+        time_remaining = game.break_time_remaining()
+        self.draw_text(f"Returning in: {int(time_remaining)} seconds", self.font30, white,
+                       screen_width//2 - 180, screen_height//2 - 30)
+
+        if time_remaining <= 0:
+            self.resume_button.draw(self.screen, self.font30)
+
+    # Draw cooldown overlay
+    def draw_cooldown_overlay(self, game):
+        # Cooldown message centered at top, the volume percentage and the instructions below it
+        cooldown_text, takebreak_text, pressp_text = COOLDOWN_TEXT
+        volume = int(100 - game.cooldown_intensity)
+        if volume != self.volume_value:
+            self.volume_value = volume
+            self.volume_surface = render_text(VOLUME_TEXT.format(volume), self.font20, red)
+        lines = ((self.get_cached_text(cooldown_text, self.font20, red), 30),
+                 (self.volume_surface, 60),
+                 (self.get_cached_text(takebreak_text, self.font20, red), 90),
+                 (self.get_cached_text(pressp_text, self.font20, red), 120))
+        return [self.blit(surface, ((screen_width - surface.get_width()) // 2, y))
+                for surface, y in lines]
+
+    # Draw enforced cooldown screen
+    def draw_enforced_cooldown(self, game):
+        # Semi-transparent overlay
+        self.blit(self.enforced_overlay, (0, 0))
+
+        # Break text
+        self.draw_text("Enforced Break", self.font40, white,
+                       screen_width//2 - 130, screen_height//2 - 100)
+        self.draw_text("Please take a moment to rest your eyes", self.font20, white,
+                       screen_width//2 - 180, screen_height//2 - 50)
+
+        # Countdown timer
+        time_remaining = game.break_time_remaining()
+        self.draw_text(f"Returning in: {int(time_remaining)} seconds", self.font30, white,
+                       screen_width//2 - 180, screen_height//2)
+
+        # Display information about cooldown that will follow
+        self.draw_text("Reduced immersion will follow this break", self.font20, white,
+                       screen_width//2 - 180, screen_height//2 + 50)
+        self.draw_text(f"Starting intensity: {int(game.cooldown_intensity)}%", self.font20, white,
+                       screen_width//2 - 180, screen_height//2 + 80)
+
+    # Draw leaderboard screen
+    def draw_leaderboard(self, game):
+        weekly_stats = game.weekly_stats
+
+        # Semi-transparent overlay
+        self.blit(self.leaderboard_overlay, (0, 0))
+
+        # Leaderboard title
+        self.draw_text("Weekly Summary", self.font40, yellow, screen_width//2 - 130, 100)
+
+        # Display stats
+        y_pos = 200
+        self.draw_text(f"Games Played: {weekly_stats['games_played']}", self.font30, white,
+                       100, y_pos)
+        y_pos += 50
+        self.draw_text(f"Breaks Taken: {weekly_stats['breaks_taken']}", self.font30, white,
+                       100, y_pos)
+        y_pos += 50
+        self.draw_text(f"Breaks Ignored: {weekly_stats['breaks_ignored']}", self.font30, white,
+                       100, y_pos)
+        y_pos += 50
+
+        # Format playtime nicely
+        hours = weekly_stats['total_play_time'] // 3600
+        minutes = (weekly_stats['total_play_time'] % 3600) // 60
+        seconds = weekly_stats['total_play_time'] % 60
+        time_str = f"{hours}h {minutes}m {seconds}s"
+        self.draw_text(f"Total Play Time: {time_str}", self.font30, white, 100, y_pos)
+        y_pos += 50
+
+        self.draw_text(f"High Score: {weekly_stats['high_score']}", self.font30, yellow, 100, y_pos)
+        y_pos += 100
+
+        self.draw_text("Press any key to continue", self.font30, white,
+                       screen_width//2 - 150, y_pos)
+
+    # Draw mode selection screen
+    def draw_mode_selection(self):
+        # Background
+        self.screen.fill((0, 0, 50))  # Dark blue background
+
+        # Title
+        self.draw_text("Space Invaders - Break Aware", self.font40, white,
+                       screen_width//2 - 220, 100)
+
+        # Description
+        self.draw_text("Select Game Mode:", self.font30, white,
+                       screen_width//2 - 100, screen_height//2 - 70)
+
+        # Draw buttons
+        self.normal_button.draw(self.screen, self.font30)
+        self.break_aware_button.draw(self.screen, self.font30)
+
+        # Mode descriptions
+        self.draw_text("Normal: Standard gameplay with break reminders", self.font20, white,
+                       screen_width//2 - 210, screen_height//2 + 140)
+        self.draw_text("Break-Aware: Enforces breaks when ignored", self.font20, white,
+                       screen_width//2 - 210, screen_height//2 + 170)
+
+
+# Renderer that repaints and flips only the parts of the screen that changed.
+# Sprites and HUD text are erased by restoring the background under last frame's
+# rects, then drawn again; full-screen overlays fall back to a complete redraw.
+class DirtyRenderer(Renderer):
+    def __init__(self, screen, cached_hud=True, bw_mode=BW_AUTO):
+        Renderer.__init__(self, screen, cached_hud, bw_mode)
+        self.previous_rects = []
+        self.full_redraw = True
+
+    def needs_full_redraw(self, game):
+        return (not game.game_mode_selected
+                or game.current_state in (STATE_LEADERBOARD_MINI, STATE_BREAK_REMINDER,
+                                          STATE_BREAK_TAKEN, STATE_ENFORCED_COOLDOWN)
+                or game.game_over != 0
+                or game.countdown > 0
+                or game.level_transition
+                or (self.bw_postprocess and self.black_and_white(game)))
+
+    def draw(self, game, mouse_pos, alpha=1.0):
+        self.alpha = alpha
+        if self.needs_full_redraw(game):
+            Renderer.draw(self, game, mouse_pos, alpha)
+            self.full_redraw = True
+            return None
+
+        if self.full_redraw:
+            self.draw_bg()
+            self.full_redraw = False
+            full = True
+        else:
+            # Erase last frame's sprites and text
+            for rect in self.previous_rects:
+                self.blit(self.bg, rect, rect)
+            full = False
+
+        rects = self.draw_hud(game)
+        rects += self.draw_health_bar(game)
+        rects += self.draw_sprites(game)
+        if game.current_state == STATE_COOLDOWN_ACTIVE:
+            started = game.profiler.start()
+            rects += self.draw_cooldown_overlay(game)
+            game.profiler.stop("overlays", started)
+
+        dirty = self.previous_rects + rects
+        self.previous_rects = rects
+        return None if full else dirty
+
+    def invalidate(self):
+        self.full_redraw = True
+
+
+# F3 performance overlay: FPS, recent frame times, per-phase timings, sprite counts and
+# draw calls. Its own text is rendered straight from the font and is left out of the counts.
+class DebugOverlay:
+    width = 230
+    graph_height = 50
+    budget_ms = 1000 / 60  # Frame budget line drawn across the histogram
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.font = fonts.font(16)
+        self.line_height = self.font.get_linesize()
+        self.renders_seen = font_render_count
+        self.blits_seen = blit_count
+
+    def draw(self, game, fps):
+        """Draw the panel and return its rect."""
+        profiler = game.profiler
+        renders = font_render_count - self.renders_seen
+        blits = blit_count - self.blits_seen
+
+        lines = [f"FPS {fps:.1f}"]
+        for phase in PHASES:
+            # collisions run inside updates and overlays inside draw
+            indent = "    " if phase in ("collisions", "overlays") else ""
+            lines.append(f"{indent}{phase}: {profiler.last[phase] * 1000:.2f} ms")
+        lines.append(f"bullets {len(game.bullet_group)}  aliens {len(game.alien_group)}")
+        lines.append(f"alien bullets {len(game.alien_bullet_group)}  "
+                     f"explosions {len(game.explosion_group)}")
+        lines.append(f"font renders {renders}  blits {blits}")
+
+        height = len(lines) * self.line_height + self.graph_height + 15
+        panel = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        y = 5
+        for line in lines:
+            panel.blit(self.font.render(line, True, white), (5, y))
+            y += self.line_height
+
+        # Frame time histogram, newest on the right; 2 px per ms
+        graph_top = y + 5
+        graph_bottom = graph_top + self.graph_height
+        x = self.width - 5 - len(profiler.frame_times)
+        for seconds in profiler.frame_times:
+            bar = min(self.graph_height, int(seconds * 2000))
+            color = green if seconds * 1000 <= self.budget_ms else red
+            pygame.draw.line(panel, color, (x, graph_bottom), (x, graph_bottom - bar))
+            x += 1
+        budget_y = graph_bottom - int(self.budget_ms * 2)
+        pygame.draw.line(panel, yellow, (5, budget_y), (self.width - 5, budget_y))
+
+        rect = self.screen.blit(panel, (10, 130))
+        self.renders_seen = font_render_count
+        self.blits_seen = blit_count
+        return rect
@@ -0,0 +1,94 @@
+import gzip
+import json
+from clock import FrameClock
+from engine import GameEngine, FrameInput
+
+REPLAY_VERSION = 1
+
+# Bit flags for the held keys in a recorded frame
+LEFT, RIGHT, FIRE, PAUSE = 1, 2, 4, 8
+
+
+def outcome(game):
+    """The end state a replay must reproduce."""
+    return {
+        "score": game.score,
+        "level": game.current_level,
+        "max_level": game.max_level_reached,
+        "games_played": game.weekly_stats["games_played"],
+    }
+
+
+def encode_input(frame_input):
+    keys = ((LEFT if frame_input.left else 0) | (RIGHT if frame_input.right else 0)
+            | (FIRE if frame_input.fire else 0) | (PAUSE if frame_input.pause else 0))
+    touch = list(frame_input.touch) if frame_input.touch is not None else None
+    return [keys, touch, [list(tap) for tap in frame_input.taps], list(frame_input.actions)]
+
+
+def decode_input(keys, touch, taps, actions):
+    return FrameInput(left=bool(keys & LEFT), right=bool(keys & RIGHT), fire=bool(keys & FIRE),
+                      pause=bool(keys & PAUSE), touch=tuple(touch) if touch is not None else None,
+                      taps=[tuple(tap) for tap in taps], actions=actions)
+
+
+# Captures the seed and every tick's input. Identical consecutive ticks are stored once
+# with a repeat count, and the file is gzipped JSON.
+class InputRecorder:
+    def __init__(self, seed, clock, mode=None):
+        self.header = {
+            "version": REPLAY_VERSION,
+            "seed": seed,
+            "mode": mode,  # Selected before the first tick, or None if the recording picks it
+            "tick_rate": clock.frame_rate,
+            "clock_start": clock.start,
+        }
+        self.runs = []  # [repeat count, keys, touch, taps, actions]
+        self.frames = 0
+
+    def record(self, frame_input):
+        entry = encode_input(frame_input)
+        if self.runs and self.runs[-1][1:] == entry:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1] + entry)
+        self.frames += 1
+
+    def save(self, path, game):
+        data = dict(self.header, frames=self.frames, inputs=self.runs, outcome=outcome(game))
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+
+def load_replay(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        replay = json.load(f)
+    if replay.get("version") != REPLAY_VERSION:
+        raise ValueError(f"{path}: unsupported replay version {replay.get('version')}")
+    return replay
+
+
+def replay_game(replay, **engine_args):
+    """Build a game and clock in the exact starting state of a recording."""
+    clock = FrameClock(replay["tick_rate"], start=replay["clock_start"])
+    game = GameEngine(persist=False, clock=clock, seed=replay["seed"], **engine_args)
+    if replay["mode"]:
+        game.select_mode(replay["mode"])
+    return game, clock
+
+
+# Player that feeds back recorded input; returns None once the recording is used up
+class ReplayPlayer:
+    def __init__(self, replay):
+        self.runs = replay["inputs"]
+        self.index = 0
+        self.remaining = self.runs[0][0] if self.runs else 0
+
+    def __call__(self, game):
+        while self.remaining == 0:
+            self.index += 1
+            if self.index >= len(self.runs):
+                return None
+            self.remaining = self.runs[self.index][0]
+        self.remaining -= 1
+        return decode_input(*self.runs[self.index][1:])
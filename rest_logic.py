@@ -1,57 +1,195 @@
 import json
 import os
+import threading
 from typing import List
 from datetime import datetime
+from persistence import atomic_write_json
+from session_stats import SessionStats
 
-# Session durations
-SESSION_FILE = "session_data.json"
+# Session history: a running summary of every session, replacing the old list of the last ten
+SESSION_STATS_FILE = "session_stats.json"
+SESSION_FILE = "session_data.json"  # Legacy list of durations, read once to seed the summary
 
 
-def load_session_durations() -> List[float]:
-    """Load previous session durations from JSON."""
+def load_session_durations_from(path: str) -> List[float]:
+    """Load session durations from a JSON file, or an empty list if it is missing or broken."""
     try:
-        if not os.path.exists(SESSION_FILE):
+        if not os.path.exists(path):
             return []
-        with open(SESSION_FILE, "r") as file:
+        with open(path, "r") as file:
             data = json.load(file)
             return data
     except Exception as e:
         return []
 
 
-def save_session_duration(duration: float):
-    """Save a session duration (in seconds)."""
+def load_session_stats(path: str = SESSION_STATS_FILE, legacy_path: str = SESSION_FILE,
+                       alpha: float = 0.2) -> SessionStats:
+    """Load the saved session summary, building it from the legacy duration list the first time.
+
+    alpha is the EWMA weight used for sessions added from now on.
+    """
     try:
-        sessions = load_session_durations()
-        sessions.append(duration)
-        sessions = sessions[-10:]  # Keep only the last 10
-        with open(SESSION_FILE, "w") as file:
-            json.dump(sessions, file)
-    except Exception as e:
+        with open(path, "r") as file:
+            stats = SessionStats.from_dict(json.load(file))
+        stats.alpha = alpha
+        return stats
+    except FileNotFoundError:
         pass
+    except (OSError, ValueError, KeyError, TypeError):
+        return SessionStats(alpha)
+    stats = SessionStats(alpha)
+    for duration in load_session_durations_from(legacy_path):
+        stats.add(duration)
+    return stats
+
+
+# Keeps the session summary and the break threshold in memory so the game loop never touches the
+# disk. The threshold follows the exponentially weighted average session, so it adapts to recent
+# play while still drawing on the whole history, and each finished session costs O(1) to add.
+class BreakPolicy:
+    def __init__(self, persist=True, path=SESSION_STATS_FILE, ratio=0.6, default_threshold=150,
+                 alpha=0.2, check_interval=5.0, writer=None):
+        self.persist = persist
+        self.writer = writer  # Optional PersistenceWorker that does the file writes
+        self.path = path
+        self.ratio = ratio  # Threshold as a fraction of the average session
+        self.default_threshold = default_threshold  # Used until there is any history
+        self.alpha = alpha  # EWMA weight of the newest session
+        self.check_interval = check_interval  # Seconds between the engine's polls, None to never
+        self.stats = SessionStats(alpha)
+        self.mtime = None
+        # Saves of our own still on the writer's queue; poll() must not mistake them for another
+        # process
+        self.lock = threading.Lock()
+        self.saves_pending = 0
+        self.reload()
+
+    def reload(self):
+        """Read the session summary from disk."""
+        if not self.persist:
+            return
+        self.stats = load_session_stats(self.path, alpha=self.alpha)
+        self.mtime = self.file_mtime()
 
+    def file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
 
-def calculate_break_trigger_time(session_durations):
-    """Calculate the break trigger time based on session durations"""
-    if not session_durations:
-        return 10  # Set to 10 seconds for testing
-    
-    # Calculate average session duration
-    avg_duration = sum(session_durations) / len(session_durations)
-    
-    # Calculate break threshold (1.5x average)
-    break_threshold = avg_duration * 1.5
-    
-    return break_threshold
+    def poll(self):
+        """Reload if another process rewrote the file; the caller decides how often to ask."""
+        if not self.persist:
+            return False
+        with self.lock:
+            if self.saves_pending or self.file_mtime() == self.mtime:
+                return False
+        self.reload()
+        return True
+
+    @property
+    def has_history(self):
+        return self.stats.count > 0
+
+    @property
+    def threshold(self):
+        """Seconds of play before a break is suggested."""
+        if not self.stats.count:
+            return self.default_threshold
+        return self.stats.ewma * self.ratio
+
+    def record(self, duration: float):
+        """Add a finished session, updating the threshold and the file."""
+        self.stats.add(duration)
+        if not self.persist:
+            return
+        state = self.stats.to_dict()
+        if self.writer:
+            with self.lock:
+                self.saves_pending += 1
+            self.writer.call(self.save, state)
+            return
+        try:
+            self.save(state)
+        except Exception as e:
+            pass
+
+    def save(self, state):
+        """Write the summary and remember the file's new mtime, so poll() knows it was ours."""
+        try:
+            atomic_write_json(self.path, state)
+        finally:
+            with self.lock:
+                self.mtime = self.file_mtime()
+                if self.writer:
+                    self.saves_pending -= 1
 
 
 # Gameplay stats
-GAME_STATS_FILE = "game_data.json"
+GAME_STATS_FILE = "game_data.json"  # Legacy format: one JSON array, rewritten on every save
+GAME_STATS_LOG = "game_data.jsonl"  # One JSON record per line, only ever appended to
+
+
+def append_stats_record(record: dict, path: str = GAME_STATS_LOG):
+    """Append one record to a JSON Lines file without reading or rewriting what is already there."""
+    line = (json.dumps(record) + "\n").encode("utf-8")
+    # Append mode sends every write to the end of the file, wherever we have seeked to
+    with open(path, "a+b") as f:
+        # A crash during an earlier append can leave a partial last line; start on a fresh one
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        # The record goes out in a single write, so it is either all there or not at all
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_game_stats(path: str = GAME_STATS_LOG):
+    """Yield each stored session record in order, skipping lines that cannot be parsed."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def migrate_game_stats(old_path: str = GAME_STATS_FILE, new_path: str = GAME_STATS_LOG) -> int:
+    """Copy records from the legacy array file into a new log; returns how many were copied.
+
+    Runs only while the log does not exist yet; the old file is left in place as a backup.
+    """
+    if os.path.exists(new_path) or not os.path.exists(old_path):
+        return 0
+    try:
+        with open(old_path, "r") as f:
+            records = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        records = []
+
+    # Build the log under a temporary name so a crash never leaves half a migration behind
+    temp_path = new_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, new_path)
+    return len(records)
 
 
 def save_game_stats(mode: str, duration: float, took_break: bool, level: int, breaks_ignored: int):
     """
-    Save gameplay session statistics to a JSON file.
+    Append gameplay session statistics to the JSON Lines stats log.
 
     Parameters:
     - mode: 'normal' or 'break-aware'
@@ -69,13 +207,5 @@ def save_game_stats(mode: str, duration: float, took_break: bool, level: int, br
         "breaks_ignored": breaks_ignored
     }
 
-    if os.path.exists(GAME_STATS_FILE):
-        with open(GAME_STATS_FILE, "r") as f:
-            all_stats = json.load(f)
-    else:
-        all_stats = []
-
-    all_stats.append(data)
-
-    with open(GAME_STATS_FILE, "w") as f:
-        json.dump(all_stats, f, indent=2)
+    migrate_game_stats()
+    append_stats_record(data)
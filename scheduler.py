@@ -0,0 +1,88 @@
+import heapq
+import itertools
+
+
+# Named one-shot timers kept in a min-heap of deadlines, so the game loop only pops the timers
+# that are due instead of comparing every deadline on every tick. Moving or cancelling a timer
+# leaves its old heap entry behind; stale entries are dropped when they reach the top.
+class Scheduler:
+    def __init__(self, time_func):
+        self.time = time_func
+        self.heap = []  # (deadline, sequence, name)
+        self.timers = {}  # name -> (deadline, pausable) for every live timer
+        self.sequence = itertools.count()  # Keeps equal deadlines in the order they were set
+        self.paused_at = None
+        self.paused = {}  # name -> seconds left on each pausable timer while paused
+
+    def __contains__(self, name):
+        return name in self.timers or name in self.paused
+
+    def schedule(self, name, delay, pausable=False):
+        """Set the named timer to go off after delay seconds of running time."""
+        if pausable and self.paused_at is not None:
+            # Starts counting down on resume()
+            self.timers.pop(name, None)
+            self.paused[name] = delay
+            return
+        self.at(name, self.time() + delay, pausable)
+
+    def at(self, name, deadline, pausable=False):
+        """Set the named timer to go off at deadline, replacing it if it is already set.
+
+        Pausable timers stop counting down between pause() and resume().
+        """
+        if pausable and self.paused_at is not None:
+            self.timers.pop(name, None)
+            self.paused[name] = deadline - self.paused_at
+            return
+        self.paused.pop(name, None)
+        self.timers[name] = (deadline, pausable)
+        heapq.heappush(self.heap, (deadline, next(self.sequence), name))
+
+    def remaining(self, name):
+        """Seconds until the named timer goes off, or None if it isn't set.
+
+        While paused, a pausable timer's remaining time only counts running time.
+        """
+        if name in self.paused:
+            return self.paused[name]
+        if name in self.timers:
+            return self.timers[name][0] - self.time()
+        return None
+
+    def cancel(self, name):
+        self.timers.pop(name, None)
+        self.paused.pop(name, None)
+
+    def pause(self):
+        if self.paused_at is not None:
+            return
+        self.paused_at = self.time()
+        for name, (deadline, pausable) in list(self.timers.items()):
+            if pausable:
+                del self.timers[name]
+                self.paused[name] = deadline - self.paused_at
+
+    def resume(self):
+        if self.paused_at is None:
+            return
+        now = self.time()
+        paused = self.paused
+        self.paused_at = None
+        self.paused = {}
+        for name, remaining in paused.items():
+            self.at(name, now + remaining, pausable=True)
+
+    def due(self, now=None):
+        """Remove and return the names of every timer due by now, earliest first."""
+        if now is None:
+            now = self.time()
+        fired = []
+        while self.heap and self.heap[0][0] <= now:
+            deadline, _, name = heapq.heappop(self.heap)
+            timer = self.timers.get(name)
+            if timer is None or timer[0] != deadline:
+                continue  # Cancelled, paused or moved since this entry was pushed
+            del self.timers[name]
+            fired.append(name)
+        return fired
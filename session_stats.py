@@ -0,0 +1,147 @@
+import math
+from bisect import insort
+
+
+# Streaming estimate of one quantile with the P-squared algorithm (Jain and Chlamtac, 1985):
+# five markers are nudged towards their ideal positions as samples arrive, so the estimate
+# costs O(1) time and memory however many samples there have been.
+class P2Quantile:
+    def __init__(self, p):
+        self.p = p
+        self.heights = []  # The first five samples sorted, then the five marker heights
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            insort(q, x)
+            return
+
+        # Find the cell the sample falls in, stretching the end markers if it is a new extreme
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the middle markers one step towards where they should be
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self.parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        q = self.heights
+        if not q:
+            return None
+        if self.positions[4] <= 5:
+            # No more than five samples, all still held: pick from them exactly
+            return q[round(self.p * (len(q) - 1))]
+        return q[2]
+
+    def to_dict(self):
+        return {"p": self.p, "heights": list(self.heights), "positions": list(self.positions),
+                "desired": list(self.desired)}
+
+    @classmethod
+    def from_dict(cls, data):
+        estimator = cls(data["p"])
+        estimator.heights = list(data["heights"])
+        estimator.positions = list(data["positions"])
+        estimator.desired = list(data["desired"])
+        return estimator
+
+
+# Running summary of every session so far: count, mean and variance (Welford's method), an
+# exponentially weighted mean that favours recent sessions, and P-squared quantiles. Adding a
+# session and reading any figure are O(1), and the whole state is a small JSON-ready dict.
+class SessionStats:
+    def __init__(self, alpha=0.2, quantiles=(0.5, 0.9)):
+        self.alpha = alpha  # Weight of the newest session in the EWMA
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared differences from the mean
+        self.ewma = None
+        self.minimum = None
+        self.maximum = None
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.ewma = x if self.ewma is None else self.alpha * x + (1 - self.alpha) * self.ewma
+        self.minimum = x if self.minimum is None else min(self.minimum, x)
+        self.maximum = x if self.maximum is None else max(self.maximum, x)
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    @property
+    def variance(self):
+        """Sample variance, 0 until there are two sessions."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, p):
+        return self.quantiles[p].value()
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "stddev": self.stddev,
+            "ewma": self.ewma,
+            "min": self.minimum,
+            "max": self.maximum,
+            **{f"p{round(p * 100)}": self.quantile(p) for p in self.quantiles},
+        }
+
+    def to_dict(self):
+        return {
+            "alpha": self.alpha,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "ewma": self.ewma,
+            "min": self.minimum,
+            "max": self.maximum,
+            "quantiles": [estimator.to_dict() for estimator in self.quantiles.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data["alpha"], quantiles=())
+        stats.count = data["count"]
+        stats.mean = data["mean"]
+        stats.m2 = data["m2"]
+        stats.ewma = data["ewma"]
+        stats.minimum = data["min"]
+        stats.maximum = data["max"]
+        for state in data["quantiles"]:
+            estimator = P2Quantile.from_dict(state)
+            stats.quantiles[estimator.p] = estimator
+        return stats
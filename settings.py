@@ -0,0 +1,79 @@
+# Shared game settings used by the engine, the sprites and the renderer
+
+# Define fps
+fps = 60
+
+# Simulation ticks per second; sprite speeds are tuned in pixels per tick at this rate
+tick_rate = 60
+# Most ticks run for one rendered frame before the backlog is dropped (avoids a spiral of death)
+max_ticks_per_frame = 5
+
+# Between waves: how long "LEVEL n!" shows, and how few aliens are left when the next wave is built
+LEVEL_UP_MS = 1000
+PREFETCH_AT_ALIENS = 3
+
+screen_width = 600
+screen_height = 800
+
+# Sprites kept in each object pool (see pools.py)
+POOL_CAPACITY = {
+    "bullets": 16,
+    "alien_bullets": 8,
+    "explosions": 48,
+}
+
+# Mixer channels reserved for each sound effect (see audio.py), and the shortest gap between two
+# plays of the same effect; plays that come sooner, or find all its channels busy, are dropped
+SOUND_CHANNELS = {
+    "laser": 3,
+    "explosion": 3,
+    "explosion2": 2,
+}
+SOUND_MIN_INTERVAL_MS = {
+    "laser": 60,
+    "explosion": 40,
+    "explosion2": 80,
+}
+
+# Break and difficulty heuristics. GameEngine(tuning=...) overrides any of them, which is how
+# farm.py sweeps them across simulated sessions.
+TUNING = {
+    "break_ratio": 0.6,  # Break threshold as a fraction of the average past session
+    "break_ewma_alpha": 0.2,  # Weight of the latest session in that average
+    "default_break_interval": 150,  # Seconds between reminders while there is no session history
+    # Seconds a reminder waits before an enforced break; also the cooldown length
+    "ignore_duration": 60,
+    "break_duration": 10,  # Seconds a break lasts
+    "cooldown_fire_slowdown": 1.5,  # Alien fire cooldown multiplier while the cooldown is active
+    "alien_speed_per_level": 0.2,  # Extra alien speed per level, as a fraction of the base speed
+    "alien_bullet_speed_per_level": 0.15,  # Extra alien bullet speed per level
+    "high_level_bullet_boost": 1.5,  # Alien bullet speed multiplier from level 5
+}
+
+# Game States
+STATE_NORMAL_PLAY = "NormalPlay"
+STATE_BREAK_REMINDER = "BreakReminder"
+STATE_BREAK_TAKEN = "BreakTaken"
+STATE_COOLDOWN_ACTIVE = "CooldownActive"
+STATE_ENFORCED_COOLDOWN = "EnforcedCooldown"
+STATE_LEADERBOARD_MINI = "LeaderboardMini"
+
+# Game Modes
+MODE_NORMAL = "Normal"
+MODE_BREAK_AWARE = "BreakAware"
+
+# Define colours
+red = (255, 0, 0)
+green = (0, 255, 0)
+white = (255, 255, 255)
+blue = (0, 0, 255)
+light_blue = (173, 216, 230)
+yellow = (255, 255, 0)
+gray = (128, 128, 128)
+
+# Where black and white mode gets its look
+BW_AUTO = "auto"  # img/bw files when they are all there, otherwise BW_TRANSFORM
+BW_FILES = "files"  # hand-made images in img/bw
+BW_TRANSFORM = "transform"  # grayscale copy of each colour image, made once at load time
+BW_POSTPROCESS = "postprocess"  # colour sprites drawn on a layer that is desaturated each frame
+BW_MODES = [BW_AUTO, BW_FILES, BW_TRANSFORM, BW_POSTPROCESS]
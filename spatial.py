@@ -0,0 +1,79 @@
+# Uniform-grid broadphase so each bullet only tests the aliens near it
+class SpatialHash:
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        # Cell (column, row) -> sprites overlapping it. Dicts keep insertion order, so
+        # queries return candidates in a stable order from run to run.
+        self.cells = {}
+        # Sprite -> (first column, first row, last column, last row) it currently covers
+        self.sprite_cells = {}
+
+        # Collision statistics, reset every frame
+        self.tests = 0  # rect tests actually performed
+        self.linear_tests = 0  # rect tests a scan of the whole group would have performed
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, sprite, cell_range):
+        self.sprite_cells[sprite] = cell_range
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), {})[sprite] = None
+
+    def remove(self, sprite):
+        x0, y0, x1, y1 = self.sprite_cells.pop(sprite)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells[(cx, cy)]
+                del cell[sprite]
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def sync(self, sprites):
+        """Bring the grid up to date with the sprites' current positions.
+
+        Only sprites that crossed into different cells are re-filed, and sprites that are
+        no longer in the group are dropped.
+        """
+        current = set()
+        for sprite in sprites:
+            current.add(sprite)
+            cell_range = self.cell_range(sprite.rect)
+            old_range = self.sprite_cells.get(sprite)
+            if old_range != cell_range:
+                if old_range is not None:
+                    self.remove(sprite)
+                self.insert(sprite, cell_range)
+        if len(self.sprite_cells) != len(current):
+            for sprite in [sprite for sprite in self.sprite_cells if sprite not in current]:
+                self.remove(sprite)
+
+    def reset_stats(self):
+        self.tests = 0
+        self.linear_tests = 0
+
+    def collide(self, sprite):
+        """Return the live sprites in the grid whose rects overlap sprite.rect."""
+        rect = sprite.rect
+        x0, y0, x1, y1 = self.cell_range(rect)
+        candidates = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    candidates.update(cell)
+
+        self.linear_tests += len(self.sprite_cells)
+        hits = []
+        for candidate in candidates:
+            # Skip sprites killed earlier this frame
+            if not candidate.alive():
+                continue
+            self.tests += 1
+            if rect.colliderect(candidate.rect):
+                hits.append(candidate)
+        return hits
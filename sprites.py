@@ -0,0 +1,309 @@
+import pygame
+import math
+import assets
+from pools import PooledSprite
+from settings import screen_width, screen_height
+
+
+# Create spaceship class
+class Spaceship(pygame.sprite.Sprite):
+    def __init__(self, game, x, y, health):
+        pygame.sprite.Sprite.__init__(self)
+        self.game = game
+        self.image = assets.image("spaceship")
+        self.bw_image = assets.bw_image("spaceship")
+        self.mask = assets.mask(self.image)
+        self.rect = self.image.get_rect()
+        self.rect.center = [x, y]
+        self.health_start = health
+        self.health_remaining = health
+        self.last_shot = self.game.ticks()
+        self.speed = 8  # Base movement speed
+        self.shoot_cooldown = 500  # milliseconds between shots
+
+    def update(self, frame_input):
+        # Set movement speed
+        speed = self.speed
+        game_over = 0
+
+        # Get key press
+        if frame_input.left and self.rect.left > 0:
+            self.rect.x -= speed
+        if frame_input.right and self.rect.right < screen_width:
+            self.rect.x += speed
+
+        # Record current time
+        time_now = self.game.ticks()
+
+        # Shoot - cooldown mechanics don't affect gameplay efficiency
+        if frame_input.fire and time_now - self.last_shot > self.shoot_cooldown:
+            self.game.play_sound("laser")
+            self.game.bullet_pool.acquire(self.rect.centerx, self.rect.top)
+            self.last_shot = time_now
+
+        if self.health_remaining <= 0:
+            self.game.explosion_pool.acquire(self.rect.centerx, self.rect.centery, 3)
+            self.kill()
+            game_over = -1
+        return game_over
+
+    def handle_touch(self, x, y):
+        """Handle touch screen input"""
+        if self.game.game_mode_selected:  # Only check if game mode is selected, not cooldown state
+            # Check if touch is on the spaceship
+            if self.rect.collidepoint(x, y):
+                time_now = self.game.ticks()
+                if time_now - self.last_shot > self.shoot_cooldown:
+                    self.game.play_sound("laser")
+                    self.game.bullet_pool.acquire(self.rect.centerx, self.rect.top)
+                    self.last_shot = time_now
+
+            # Handle movement for all touch positions
+            # Calculate the difference between touch position and spaceship center
+            diff_x = x - self.rect.centerx
+
+            # Move spaceship based on touch position with smooth movement
+            if abs(diff_x) > 5:  # Add a small deadzone to prevent jitter
+                if diff_x > 0 and self.rect.right < screen_width:
+                    self.rect.x += self.speed
+                elif diff_x < 0 and self.rect.left > 0:
+                    self.rect.x -= self.speed
+
+
+# Create Bullets class
+class Bullets(PooledSprite):
+    def __init__(self, game, x, y):
+        pygame.sprite.Sprite.__init__(self)
+        self.game = game
+        self.image = assets.image("bullet")
+        self.bw_image = assets.bw_image("bullet")
+        self.rect = self.image.get_rect()
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.rect.center = [x, y]
+        # A recycled bullet may have been elsewhere at the start of the tick
+        self.game.snap_position(self)
+
+    def update(self):
+        self.rect.y -= 5
+        if self.rect.bottom < 0:
+            self.kill()
+        # Only the aliens in the cells this bullet overlaps are tested
+        started = self.game.profiler.start()
+        hits = self.game.alien_grid.collide(self)
+        self.game.profiler.stop("collisions", started)
+        if hits:
+            for alien in hits:
+                if alien.is_boss:
+                    alien.health -= 1
+                    if alien.health <= 0:
+                        alien.kill()
+                        self.game.explosion_pool.acquire(alien.rect.centerx, alien.rect.centery, 3)
+                        self.game.score += 50  # Boss worth more points
+                elif alien.special_type == "tank":
+                    alien.health -= 1
+                    if alien.health <= 0:
+                        alien.kill()
+                        self.game.explosion_pool.acquire(alien.rect.centerx, alien.rect.centery, 2)
+                        self.game.score += 20  # Tank worth more points
+                else:
+                    alien.kill()
+                    self.game.explosion_pool.acquire(alien.rect.centerx, alien.rect.centery, 2)
+                    self.game.score += 10
+            self.kill()
+            self.game.play_sound("explosion")
+
+
+# Create Aliens class
+class Aliens(pygame.sprite.Sprite):
+    def __init__(self, game, x, y, level=None, rng=None):
+        pygame.sprite.Sprite.__init__(self)
+        self.game = game
+        self.is_boss = False
+        self.health = 1
+        self.special_type = None
+        # The alien picture comes from rng, the game's random generator unless the wave has its own
+        self.image_name = f"alien{(rng or game.random).randint(1, 5)}"
+        self.image = assets.image(self.image_name)
+        self.bw_image = assets.bw_image(self.image_name)
+        self.mask = assets.mask(self.image)
+        self.rect = self.image.get_rect()
+        self.rect.center = [x, y]
+        self.move_counter = 0
+        self.move_direction = 1
+        self.base_speed = 1
+        # level is the wave's level, which can be ahead of the current one while it is prefetched
+        level = game.current_level if level is None else level
+        self.speed_multiplier = 1 + (level - 1) * game.tuning["alien_speed_per_level"]
+        self.angle = 0  # For special movement patterns
+
+    def make_boss(self):
+        self.is_boss = True
+        self.health = 5  # Boss needs 5 hits
+        self.image_name = "boss"
+        self.image = assets.image("boss")
+        self.bw_image = assets.bw_image("boss")
+        self.mask = assets.mask(self.image)
+        self.rect = self.image.get_rect()
+        self.rect.center = [screen_width // 2, 100]
+
+    def make_special(self, special_type):
+        self.special_type = special_type
+        if special_type == "fast":
+            self.base_speed *= 2
+            self.image = assets.scaled_image(self.image_name, (40, 40))  # Make it smaller
+            self.mask = assets.mask(self.image)
+        elif special_type == "tank":
+            self.health = 3
+            self.image = assets.scaled_image(self.image_name, (60, 60))  # Make it bigger
+            self.mask = assets.mask(self.image)
+        elif special_type == "zigzag":
+            self.angle = 0
+            self.base_speed *= 1.5
+
+    def update(self):
+        if self.is_boss:
+            # Boss movement pattern
+            self.rect.x += math.sin(self.game.ticks() * 0.003) * 2
+            self.rect.y += math.cos(self.game.ticks() * 0.002) * 1
+        elif self.special_type == "zigzag":
+            # Zigzag movement
+            self.angle += 0.1
+            self.rect.x += math.sin(self.angle) * 3
+            self.rect.y += 0.5
+        else:
+            # Regular alien movement
+            move_speed = self.base_speed * self.speed_multiplier
+            self.rect.x += self.move_direction * move_speed
+            self.move_counter += 1
+            if abs(self.move_counter) > 75:
+                self.move_direction *= -1
+                self.move_counter *= self.move_direction
+                # Move down when changing direction
+                self.rect.y += 20
+
+        # Check if alien has reached the bottom
+        if self.rect.bottom >= screen_height - 100:  # 100 pixels from bottom
+            self.game.game_over = -1  # Trigger game over
+
+
+# Shared movement for the regular aliens of a wave. They all move in lockstep, so the
+# counter, direction and speed are kept once here and each frame's offset is applied
+# to every member rect instead of running Aliens.update per sprite.
+class Formation:
+    def __init__(self, game, level=None):
+        self.game = game
+        self.members = pygame.sprite.Group()
+        self.move_counter = 0
+        self.move_direction = 1
+        self.base_speed = 1
+        level = game.current_level if level is None else level
+        self.speed_multiplier = 1 + (level - 1) * game.tuning["alien_speed_per_level"]
+        # Used to round each move exactly the way a Rect rounds a per-sprite move
+        self.probe = pygame.Rect(0, 0, 0, 0)
+
+    def add(self, alien):
+        self.members.add(alien)
+
+    def update(self):
+        if not self.members:
+            return
+        move_speed = self.base_speed * self.speed_multiplier
+        self.probe.x = screen_width
+        self.probe.x += self.move_direction * move_speed
+        dx = self.probe.x - screen_width
+        for alien in self.members:
+            alien.rect.x += dx
+
+        self.move_counter += 1
+        if abs(self.move_counter) > 75:
+            self.move_direction *= -1
+            self.move_counter *= self.move_direction
+            # Move down when changing direction
+            for alien in self.members:
+                alien.rect.y += 20
+
+            # Regular aliens only move down here, so this is the only place they can reach the
+            # bottom, 100 pixels from the edge of the screen
+            if max(alien.rect.bottom for alien in self.members) >= screen_height - 100:
+                self.game.game_over = -1  # Trigger game over
+
+
+# Create Alien Bullets class
+class Alien_Bullets(PooledSprite):
+    def __init__(self, game, x, y):
+        pygame.sprite.Sprite.__init__(self)
+        self.game = game
+        self.image = assets.image("alien_bullet")
+        self.bw_image = assets.bw_image("alien_bullet")
+        self.mask = assets.mask(self.image)
+        self.rect = self.image.get_rect()
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        game = self.game
+        self.rect.center = [x, y]
+        game.snap_position(self)
+
+        # Speed increases with level
+        self.base_speed = 2
+        per_level = game.tuning["alien_bullet_speed_per_level"]
+        self.speed_multiplier = 1 + (game.current_level - 1) * per_level
+        if game.current_level >= 5:
+            # Faster still for high levels
+            self.speed_multiplier *= game.tuning["high_level_bullet_boost"]
+
+    def update(self):
+        bullet_speed = self.base_speed * self.speed_multiplier
+        self.rect.y += bullet_speed
+        if self.rect.top > screen_height:
+            self.kill()
+        started = self.game.profiler.start()
+        hit = self.hits_spaceship()
+        self.game.profiler.stop("collisions", started)
+        if hit:
+            self.kill()
+            self.game.play_sound("explosion2")
+            # Reduce spaceship health
+            self.game.spaceship.health_remaining -= 1
+            self.game.explosion_pool.acquire(self.rect.centerx, self.rect.centery, 1)
+
+    def hits_spaceship(self):
+        spaceship = self.game.spaceship
+        # Cheap rect test first; only overlapping rects need the pixel masks
+        if not spaceship.alive() or not self.rect.colliderect(spaceship.rect):
+            return False
+        self.game.mask_tests += 1
+        return pygame.sprite.collide_mask(self, spaceship) is not None
+
+
+# Create Explosion class
+class Explosion(PooledSprite):
+    def __init__(self, x, y, size):
+        pygame.sprite.Sprite.__init__(self)
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, size)
+
+    def reset(self, x, y, size):
+        # Frames are pre-scaled and shared between all explosions of this size
+        self.images, self.bw_images = assets.explosion(size)
+        self.index = 0
+        self.image = self.images[self.index]
+        self.rect.size = self.image.get_size()
+        self.rect.center = [x, y]
+        self.counter = 0
+
+    def update(self):
+        explosion_speed = 3
+        # Update explosion animation
+        self.counter += 1
+
+        if self.counter >= explosion_speed and self.index < len(self.images) - 1:
+            self.counter = 0
+            self.index += 1
+            self.image = self.images[self.index]
+
+        # If the animation is complete, delete explosion
+        if self.index >= len(self.images) - 1 and self.counter >= explosion_speed:
+            self.kill()
@@ -0,0 +1,61 @@
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+# Reads the files the first frame doesn't need (images and sounds) on a small thread pool while the
+# mode selection screen is already up, and times every startup step on either side for
+# --startup-profile. Only file I/O goes to the pool: SDL surface, display and mixer calls are not
+# safe off the main thread, so decoding and building the engine stay there. Without threads (the
+# web build) submitted work runs inline instead.
+class StartupLoader:
+    def __init__(self, workers=2, threaded=True):
+        self.start = time.perf_counter()
+        self.executor = None
+        if threaded:
+            self.executor = ThreadPoolExecutor(workers, thread_name_prefix="startup")
+        self.lock = threading.Lock()
+        self.steps = []  # (name, thread name, seconds from start, seconds taken)
+        self.marks = {}  # milestone -> seconds from start
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self.lock:
+                thread = threading.current_thread().name
+                self.steps.append((name, thread, started - self.start, ended - started))
+
+    def timed(self, name, func, *args, **kwargs):
+        with self.step(name):
+            return func(*args, **kwargs)
+
+    def submit(self, name, func, *args, **kwargs):
+        """Run func on the pool as a timed step; returns a Future for its result."""
+        if self.executor is not None:
+            return self.executor.submit(self.timed, name, func, *args, **kwargs)
+        future = Future()
+        try:
+            future.set_result(self.timed(name, func, *args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def mark(self, milestone):
+        self.marks.setdefault(milestone, time.perf_counter() - self.start)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+    def report(self):
+        lines = [f"{'startup step':<24}{'start ms':>10}{'took ms':>10}  thread"]
+        for name, thread, started, seconds in sorted(self.steps, key=lambda step: step[2]):
+            lines.append(f"{name:<24}{started * 1000:>10.1f}{seconds * 1000:>10.1f}  {thread}")
+        for milestone, seconds in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"{milestone} at {seconds * 1000:.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,113 @@
+import pygame
+import pytest
+import audio
+from audio import AudioManager, SOUND_FILES
+from settings import SOUND_CHANNELS, SOUND_MIN_INTERVAL_MS
+
+
+class StubSound:
+    def __init__(self):
+        self.volumes = []
+
+    def set_volume(self, volume):
+        self.volumes.append(volume)
+
+
+class StubChannel:
+    def __init__(self):
+        self.busy = False
+        self.plays = 0
+
+    def get_busy(self):
+        return self.busy
+
+    def play(self, sound):
+        self.busy = True
+        self.plays += 1
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(audio, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def manager(clock):
+    manager = AudioManager()
+    manager.sounds = {name: StubSound() for name in SOUND_FILES}
+    manager.channels = {name: [StubChannel() for _ in range(SOUND_CHANNELS[name])]
+                        for name in SOUND_FILES}
+    return manager
+
+
+def test_repeats_inside_the_minimum_interval_are_rate_limited(manager, clock):
+    interval = SOUND_MIN_INTERVAL_MS["laser"] / 1000
+    assert manager.play("laser")
+    clock.now += interval / 2
+    assert not manager.play("laser")
+    clock.now += interval
+    assert manager.play("laser")
+    # Other effects keep their own interval
+    assert manager.play("explosion")
+    assert manager.stats()["by_effect"]["laser"] == (2, 1, 0)
+    assert manager.stats()["played"] == 3
+
+
+def test_play_is_dropped_when_every_reserved_channel_is_busy(manager, clock):
+    channels = manager.channels["explosion2"]
+    for _ in channels:
+        clock.now += 1
+        assert manager.play("explosion2")
+    assert all(channel.plays == 1 for channel in channels)
+
+    clock.now += 1
+    assert not manager.play("explosion2")
+    assert manager.dropped["explosion2"] == 1
+
+    channels[0].busy = False
+    clock.now += 1
+    assert manager.play("explosion2")
+    assert channels[0].plays == 2
+    assert manager.stats()["dropped"] == 1
+
+
+def test_volume_is_only_set_when_the_scale_changes(manager):
+    laser = manager.sounds["laser"]
+    manager.set_volume_scale(1.0)
+    assert laser.volumes == []
+    manager.set_volume_scale(0.5)
+    manager.set_volume_scale(0.5)
+    assert laser.volumes == [SOUND_FILES["laser"][1] * 0.5]
+    # Playing never touches the volume
+    manager.play("laser")
+    assert len(laser.volumes) == 1
+
+
+def test_unloaded_effects_are_not_played():
+    manager = AudioManager()
+    assert not manager.play("laser")
+    assert manager.stats()["played"] == 0
+
+
+def test_load_reserves_channels_with_the_dummy_driver():
+    pygame.mixer.init()
+    try:
+        manager = AudioManager()
+        assert manager.load(AudioManager.read_files())
+        assert pygame.mixer.get_num_channels() >= sum(SOUND_CHANNELS.values())
+        counts = {name: len(channels) for name, channels in manager.channels.items()}
+        assert counts == SOUND_CHANNELS
+        volume = manager.sounds["laser"].get_volume()
+        assert volume == pytest.approx(SOUND_FILES["laser"][1], abs=0.01)
+    finally:
+        pygame.mixer.quit()
@@ -0,0 +1,156 @@
+import pytest
+import headless
+from clock import FrameClock
+from engine import GameEngine, FrameInput, TIMER_REMINDER
+from settings import (LEVEL_UP_MS, PREFETCH_AT_ALIENS, MODE_NORMAL, MODE_BREAK_AWARE,
+                      STATE_NORMAL_PLAY, STATE_BREAK_REMINDER, STATE_ENFORCED_COOLDOWN,
+                      STATE_COOLDOWN_ACTIVE)
+
+IDLE = FrameInput()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def loaded_assets():
+    headless.init_headless()
+
+
+def new_game(mode=MODE_NORMAL, **tuning):
+    clock = FrameClock(start=0)
+    game = GameEngine(persist=False, clock=clock, seed=3, tuning=tuning)
+    game.select_mode(mode)
+    return game, clock
+
+
+def step(game, clock, frame_input=IDLE):
+    game.step(frame_input)
+    clock.advance()
+
+
+def run_until(game, clock, done, frame_input=IDLE, limit=100000):
+    """Step until done(game) holds; returns the number of ticks it took."""
+    for ticks in range(limit):
+        if done(game):
+            return ticks
+        step(game, clock, frame_input)
+    raise AssertionError("condition never held")
+
+
+def start_play(game, clock):
+    run_until(game, clock, lambda game: game.countdown == 0)
+
+
+def positions(game):
+    return [sprite.rect.topleft for sprite in game.spaceship_group.sprites()
+            + game.alien_group.sprites()]
+
+
+def test_cleared_wave_is_replaced_by_the_prefetched_one_within_a_tick():
+    game, clock = new_game()
+    start_play(game, clock)
+    for alien in game.alien_group.sprites()[PREFETCH_AT_ALIENS:]:
+        alien.kill()
+    step(game, clock)
+    prefetched = game.next_wave
+    assert prefetched is not None and prefetched.level == 2
+    assert game.current_level == 1
+
+    for alien in game.alien_group.sprites():
+        alien.kill()
+    step(game, clock)
+    assert game.current_level == 2
+    assert set(game.alien_group) == set(prefetched.aliens)
+    assert game.next_wave is None
+    assert game.level_transition
+
+
+def test_aliens_and_player_hold_still_until_the_level_is_announced():
+    game, clock = new_game()
+    start_play(game, clock)
+    for alien in game.alien_group.sprites():
+        alien.kill()
+    step(game, clock)
+    assert game.current_level == 2
+
+    frozen = positions(game)
+    held = run_until(game, clock, lambda game: not game.level_transition, FrameInput(left=True))
+    assert held == pytest.approx(LEVEL_UP_MS / 1000 * clock.frame_rate, abs=1)
+    assert positions(game) == frozen
+    assert not game.alien_bullet_group
+
+    step(game, clock, FrameInput(left=True))
+    assert positions(game) != frozen
+
+
+def test_game_over_reset_discards_a_stale_prefetched_wave():
+    game, clock = new_game()
+    start_play(game, clock)
+    for alien in game.alien_group.sprites()[PREFETCH_AT_ALIENS:]:
+        alien.kill()
+    step(game, clock)
+    prefetched = game.next_wave
+    assert prefetched is not None
+
+    game.spaceship.health_remaining = 0
+    step(game, clock)
+    assert game.game_over == -1
+    step(game, clock, FrameInput(actions=["new_game"]))
+    assert game.game_over == 0
+    assert game.current_level == 1
+    assert game.next_wave is None
+    assert len(game.alien_group) == game.rows * game.cols
+    assert not set(game.alien_group) & set(prefetched.aliens)
+
+
+# Short break timings, in seconds, so a whole cycle takes a few hundred ticks
+BREAK_TUNING = {"default_break_interval": 10, "ignore_duration": 3, "break_duration": 2}
+
+
+def test_ignored_reminder_leads_through_enforced_break_and_cooldown_back_to_play():
+    game, clock = new_game(MODE_BREAK_AWARE, **BREAK_TUNING)
+    game.spaceship.health_remaining = 10 ** 6  # Stray alien bullets must not end the game
+    start_play(game, clock)
+    started = clock.time()
+
+    run_until(game, clock, lambda game: game.current_state == STATE_BREAK_REMINDER)
+    assert clock.time() - started == pytest.approx(10, abs=0.05)
+
+    step(game, clock, FrameInput(actions=["ignore_break"]))
+    assert game.current_state == STATE_ENFORCED_COOLDOWN
+    assert game.cooldown_intensity == 25
+    entered = clock.time()
+
+    run_until(game, clock, lambda game: game.current_state != STATE_ENFORCED_COOLDOWN)
+    assert game.current_state == STATE_COOLDOWN_ACTIVE
+    assert clock.time() - entered == pytest.approx(2, abs=0.05)
+    entered = clock.time()
+
+    run_until(game, clock, lambda game: game.current_state != STATE_COOLDOWN_ACTIVE)
+    assert game.current_state == STATE_NORMAL_PLAY
+    assert clock.time() - entered == pytest.approx(3, abs=0.05)
+    # Ignoring restarted the reminder; the enforced break and the cooldown used half of it
+    assert game.scheduler.remaining(TIMER_REMINDER) == pytest.approx(5, abs=0.05)
+
+
+def test_reminder_timer_stands_still_on_the_game_over_screen():
+    game, clock = new_game(**BREAK_TUNING)
+    start_play(game, clock)
+    for _ in range(60):
+        step(game, clock)
+
+    game.spaceship.health_remaining = 0
+    step(game, clock)
+    assert game.game_over == -1
+    remaining = game.scheduler.remaining(TIMER_REMINDER)
+    assert remaining == pytest.approx(9, abs=0.05)
+
+    # A minute on the game over screen, far longer than the reminder interval
+    for _ in range(60 * clock.frame_rate):
+        step(game, clock)
+    assert game.current_state == STATE_NORMAL_PLAY
+    assert game.scheduler.remaining(TIMER_REMINDER) == pytest.approx(remaining)
+
+    step(game, clock, FrameInput(actions=["new_game"]))
+    assert game.scheduler.remaining(TIMER_REMINDER) == pytest.approx(remaining, abs=0.05)
+    restarted = clock.time()
+    run_until(game, clock, lambda game: game.current_state == STATE_BREAK_REMINDER)
+    assert clock.time() - restarted == pytest.approx(remaining, abs=0.05)
@@ -0,0 +1,67 @@
+import pygame
+import pytest
+import render as render_module
+from hud import GlyphStrip, HudField
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 30)
+
+
+class CountingRender:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text, font, color):
+        self.calls += 1
+        return font.render(text, True, color)
+
+
+def test_field_is_composed_only_when_its_value_changes(font):
+    render = CountingRender()
+    glyphs = GlyphStrip(render, font, (255, 255, 255))
+    field = HudField(render, font, (255, 255, 255), "SCORE: ", (10, 30), glyphs)
+    renders = render.calls
+
+    field.set(120)
+    first = field.surface
+    field.set(120)
+    assert field.surface is first
+    field.set("120")
+    assert field.surface is first
+    field.set(130)
+    assert field.surface is not first
+    # Digits come from the glyph strip, never from a new font render
+    assert render.calls == renders
+
+
+def test_field_is_as_wide_as_label_and_digits(font):
+    render = CountingRender()
+    glyphs = GlyphStrip(render, font, (255, 255, 255))
+    field = HudField(render, font, (255, 255, 255), "Aliens: ", (0, 0), glyphs)
+    field.set("12/40")
+    label_width = font.size("Aliens: ")[0]
+    digit_width = sum(font.size(char)[0] for char in "12/40")
+    assert field.surface.get_width() == label_width + digit_width
+
+
+class CooldownGame:
+    cooldown_intensity = 25
+
+
+def test_cooldown_overlay_renders_only_a_changed_volume_line():
+    screen = pygame.Surface((render_module.screen_width, render_module.screen_height))
+    renderer = render_module.Renderer(screen)
+    game = CooldownGame()
+    renderer.draw_cooldown_overlay(game)
+    renders = render_module.font_render_count
+    renderer.draw_cooldown_overlay(game)
+    assert render_module.font_render_count == renders
+
+    game.cooldown_intensity = 75
+    rects = renderer.draw_cooldown_overlay(game)
+    assert render_module.font_render_count == renders + 1
+    assert renderer.volume_value == 25
+    assert len(rects) == 4
@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import pytest
+from persistence import PersistenceWorker, atomic_write_json
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / "leaderboard.json")
+    atomic_write_json(path, {"scores": [1]})
+    atomic_write_json(path, {"scores": [1, 2]}, indent=2)
+    with open(path) as f:
+        assert json.load(f) == {"scores": [1, 2]}
+    assert os.listdir(tmp_path) == ["leaderboard.json"]
+
+
+def test_failed_atomic_write_leaves_the_old_file(tmp_path):
+    path = str(tmp_path / "leaderboard.json")
+    atomic_write_json(path, {"scores": [1]})
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"scores": object()})
+    with open(path) as f:
+        assert json.load(f) == {"scores": [1]}
+
+
+def test_writes_to_one_path_coalesce_while_queued(tmp_path):
+    path = str(tmp_path / "leaderboard.json")
+    worker = PersistenceWorker()
+    # Hold the worker so the writes below queue up behind this job
+    started, release = threading.Event(), threading.Event()
+    worker.call(lambda: (started.set(), release.wait(5)))
+    assert started.wait(5)
+    for i in range(10):
+        worker.write_json(path, {"version": i})
+    release.set()
+    assert worker.shutdown(timeout=5)
+
+    with open(path) as f:
+        assert json.load(f) == {"version": 9}
+    stats = worker.stats()
+    assert stats["submitted"] == 11
+    assert stats["coalesced"] == 9
+    assert stats["writes"] == 2
+    assert stats["errors"] == 0
+
+
+def test_calls_are_never_coalesced_and_keep_their_order():
+    worker = PersistenceWorker()
+    done = []
+    for i in range(20):
+        worker.call(done.append, i)
+    assert worker.shutdown(timeout=5)
+    assert done == list(range(20))
+    assert worker.stats()["coalesced"] == 0
+
+
+def test_unthreaded_worker_writes_immediately(tmp_path):
+    path = str(tmp_path / "stats.json")
+    worker = PersistenceWorker(threaded=False)
+    worker.write_json(path, [1, 2, 3])
+    with open(path) as f:
+        assert json.load(f) == [1, 2, 3]
+
+
+def test_errors_are_kept_and_the_worker_carries_on(tmp_path):
+    path = str(tmp_path / "stats.json")
+    worker = PersistenceWorker()
+
+    def fail():
+        raise OSError("disk full")
+
+    worker.call(fail)
+    worker.write_json(path, {"ok": True})
+    assert worker.shutdown(timeout=5)
+    assert worker.stats()["errors"] == 1
+    with open(path) as f:
+        assert json.load(f) == {"ok": True}
@@ -0,0 +1,88 @@
+import pygame
+from pools import PooledSprite, SpritePool, OVERFLOW_GROW, OVERFLOW_DROP, OVERFLOW_RECYCLE
+
+
+class Dot(PooledSprite):
+    built = 0
+
+    def __init__(self, x):
+        super().__init__()
+        Dot.built += 1
+        self.reset(x)
+
+    def reset(self, x):
+        self.x = x
+
+
+def make_pool(capacity, overflow=OVERFLOW_GROW, prefill=True):
+    group = pygame.sprite.Group()
+    pool = SpritePool(Dot, group, capacity, overflow, prefill_args=(0,) if prefill else None)
+    return pool, group
+
+
+def test_prefill_builds_every_sprite_up_front():
+    Dot.built = 0
+    pool, group = make_pool(4)
+    assert Dot.built == 4
+    sprites = [pool.acquire(i) for i in range(4)]
+    assert Dot.built == 4
+    assert [sprite.x for sprite in sprites] == [0, 1, 2, 3]
+    assert set(group) == set(sprites)
+    assert pool.stats()["hits"] == 4
+    assert pool.stats()["misses"] == 0
+
+
+def test_killed_sprites_are_reused():
+    pool, group = make_pool(2)
+    first = pool.acquire(1)
+    first.kill()
+    first.kill()  # A second kill in the same update must not release it twice
+    assert pool.live == 0
+    assert len(pool.free) == 2
+    assert pool.acquire(2) is first
+    assert first.x == 2
+    assert first in group
+
+
+def test_grow_builds_extra_sprites_and_discards_them_on_release():
+    pool, group = make_pool(2)
+    sprites = [pool.acquire(i) for i in range(3)]
+    assert len(group) == 3
+    assert pool.stats()["misses"] == 1
+    assert pool.stats()["high_water"] == 3
+    for sprite in sprites:
+        sprite.kill()
+    assert pool.live == 0
+    assert len(pool.free) == 2
+
+
+def test_drop_refuses_past_capacity():
+    pool, group = make_pool(2, OVERFLOW_DROP)
+    pool.acquire(1)
+    pool.acquire(2)
+    assert pool.acquire(3) is None
+    assert len(group) == 2
+    assert pool.stats()["dropped"] == 1
+
+
+def test_recycle_takes_over_the_oldest_sprite():
+    pool, group = make_pool(2, OVERFLOW_RECYCLE)
+    oldest = pool.acquire(1)
+    newer = pool.acquire(2)
+    reused = pool.acquire(3)
+    assert reused is oldest
+    assert reused.x == 3
+    assert set(group) == {newer, reused}
+    assert pool.live == 2
+    assert pool.stats()["recycled"] == 1
+
+
+def test_clear_returns_everything():
+    pool, group = make_pool(3, prefill=False)
+    for i in range(3):
+        pool.acquire(i)
+    assert pool.stats()["misses"] == 3
+    pool.clear()
+    assert not group
+    assert pool.live == 0
+    assert len(pool.free) == 3
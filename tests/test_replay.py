@@ -0,0 +1,29 @@
+import headless
+from replay import FIRE, load_replay
+
+
+def test_recorded_run_replays_to_the_same_outcome(tmp_path):
+    path = str(tmp_path / "run.replay.gz")
+    recorded = headless.run(3000, seed=2, recorder_path=path)
+    assert recorded["score"] > 0
+
+    replay = load_replay(path)
+    assert replay["frames"] == recorded["frames"]
+    replayed = headless.run(0, replay=replay)
+    assert replayed["matches_recording"]
+    assert replayed["frames"] == recorded["frames"]
+    for key in ("score", "level", "games_played"):
+        assert replayed[key] == recorded[key]
+
+
+def test_tampered_inputs_report_a_mismatch(tmp_path):
+    path = str(tmp_path / "run.replay.gz")
+    headless.run(3000, seed=2, recorder_path=path)
+
+    replay = load_replay(path)
+    # Never fire: the same seed can no longer reach the recorded score
+    for run in replay["inputs"]:
+        run[1] &= ~FIRE
+    replayed = headless.run(0, replay=replay)
+    assert replayed["frames"] == replay["frames"]
+    assert not replayed["matches_recording"]
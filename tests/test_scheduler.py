@@ -0,0 +1,103 @@
+import random
+from scheduler import Scheduler
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler():
+    time = FakeTime()
+    return Scheduler(time), time
+
+
+def test_due_returns_timers_in_deadline_order():
+    scheduler, time = make_scheduler()
+    rng = random.Random(5)
+    deadlines = {f"timer{i}": rng.uniform(0, 100) for i in range(50)}
+    for name, deadline in deadlines.items():
+        scheduler.at(name, deadline)
+    fired = []
+    for now in range(0, 101, 10):
+        time.now = now
+        due = scheduler.due()
+        assert all(deadlines[name] <= now for name in due)
+        fired.extend(due)
+    assert fired == sorted(deadlines, key=deadlines.get)
+    assert scheduler.due() == []
+
+
+def test_equal_deadlines_fire_in_the_order_they_were_set():
+    scheduler, time = make_scheduler()
+    for name in ("c", "a", "b"):
+        scheduler.at(name, 5)
+    time.now = 5
+    assert scheduler.due() == ["c", "a", "b"]
+
+
+def test_cancel_and_move_leave_no_stale_firing():
+    scheduler, time = make_scheduler()
+    scheduler.at("cancelled", 1)
+    scheduler.at("moved", 2)
+    scheduler.at("kept", 3)
+    scheduler.cancel("cancelled")
+    scheduler.at("moved", 10)
+    assert "cancelled" not in scheduler
+    assert "moved" in scheduler
+    time.now = 5
+    assert scheduler.due() == ["kept"]
+    time.now = 10
+    assert scheduler.due() == ["moved"]
+    assert not scheduler.heap
+
+
+def test_pause_stops_only_pausable_timers():
+    scheduler, time = make_scheduler()
+    scheduler.schedule("reminder", 10, pausable=True)
+    scheduler.schedule("leaderboard", 10)
+    time.now = 4
+    scheduler.pause()
+    assert scheduler.remaining("reminder") == 6
+    time.now = 20
+    assert scheduler.due() == ["leaderboard"]
+    assert scheduler.remaining("reminder") == 6
+    scheduler.resume()
+    assert scheduler.remaining("reminder") == 6
+    time.now = 25
+    assert scheduler.due() == []
+    time.now = 26
+    assert scheduler.due() == ["reminder"]
+
+
+def test_timers_set_while_paused_start_counting_on_resume():
+    scheduler, time = make_scheduler()
+    scheduler.pause()
+    time.now = 5
+    scheduler.schedule("relative", 10, pausable=True)
+    scheduler.at("absolute", 7, pausable=True)  # 7 seconds after the pause began
+    time.now = 50
+    assert scheduler.due() == []
+    scheduler.resume()
+    assert scheduler.remaining("relative") == 10
+    assert scheduler.remaining("absolute") == 7
+    time.now = 57
+    assert scheduler.due() == ["absolute"]
+    time.now = 60
+    assert scheduler.due() == ["relative"]
+
+
+def test_repeated_pause_and_resume_are_ignored():
+    scheduler, time = make_scheduler()
+    scheduler.schedule("reminder", 10, pausable=True)
+    time.now = 2
+    scheduler.pause()
+    time.now = 6
+    scheduler.pause()
+    scheduler.resume()
+    scheduler.resume()
+    assert scheduler.remaining("reminder") == 8
+    assert scheduler.remaining("missing") is None
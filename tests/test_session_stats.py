@@ -0,0 +1,101 @@
+import json
+import os
+import random
+import statistics
+import pytest
+from persistence import PersistenceWorker
+from rest_logic import BreakPolicy
+from session_stats import P2Quantile, SessionStats
+
+
+def exact_quantile(data, p):
+    ordered = sorted(data)
+    return ordered[round(p * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize("p", [0.1, 0.5, 0.9])
+@pytest.mark.parametrize("distribution", ["uniform", "exponential", "normal"])
+def test_p2_tracks_the_sorted_quantile(p, distribution):
+    rng = random.Random(7)
+    draw = {
+        "uniform": lambda: rng.uniform(0, 1000),
+        "exponential": lambda: rng.expovariate(1 / 300),
+        "normal": lambda: rng.gauss(600, 120),
+    }[distribution]
+    data = [draw() for _ in range(5000)]
+    estimator = P2Quantile(p)
+    for x in data:
+        estimator.add(x)
+    spread = exact_quantile(data, 0.95) - exact_quantile(data, 0.05)
+    assert abs(estimator.value() - exact_quantile(data, p)) < 0.05 * spread
+
+
+def test_p2_is_exact_for_up_to_five_samples():
+    for count in range(1, 6):
+        data = [30, 10, 50, 20, 40][:count]
+        for p in (0.0, 0.5, 0.9, 1.0):
+            estimator = P2Quantile(p)
+            for x in data:
+                estimator.add(x)
+            assert estimator.value() == exact_quantile(data, p)
+    assert P2Quantile(0.5).value() is None
+
+
+def test_summary_matches_the_whole_history():
+    rng = random.Random(3)
+    data = [rng.uniform(30, 900) for _ in range(500)]
+    stats = SessionStats(alpha=0.2)
+    for x in data:
+        stats.add(x)
+    ewma = data[0]
+    for x in data[1:]:
+        ewma = 0.2 * x + 0.8 * ewma
+    assert stats.count == 500
+    assert stats.mean == pytest.approx(statistics.mean(data))
+    assert stats.stddev == pytest.approx(statistics.stdev(data))
+    assert stats.ewma == pytest.approx(ewma)
+    assert (stats.minimum, stats.maximum) == (min(data), max(data))
+
+
+def test_round_trip_through_json_continues_the_same_estimate():
+    rng = random.Random(4)
+    data = [rng.uniform(0, 100) for _ in range(200)]
+    whole, split = SessionStats(), SessionStats()
+    for x in data[:100]:
+        whole.add(x)
+        split.add(x)
+    split = SessionStats.from_dict(json.loads(json.dumps(split.to_dict())))
+    for x in data[100:]:
+        whole.add(x)
+        split.add(x)
+    assert split.summary() == pytest.approx(whole.summary())
+
+
+def test_policy_does_not_reload_its_own_writes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # No legacy session_data.json to seed from
+    path = str(tmp_path / "session_stats.json")
+    writer = PersistenceWorker()
+    policy = BreakPolicy(path=path, writer=writer)
+    policy.record(300)
+    assert writer.flush(timeout=5)
+    assert os.path.exists(path)
+    assert not policy.poll()
+
+    # Another process's write is picked up
+    other = BreakPolicy(path=path)
+    other.record(600)
+    os.utime(path, (0, policy.mtime + 10))
+    assert policy.poll()
+    assert policy.stats.count == 2
+    writer.shutdown()
+
+
+def test_policy_threshold_is_ratio_times_the_ewma():
+    policy = BreakPolicy(persist=False, ratio=0.5, default_threshold=150, alpha=0.5)
+    assert policy.threshold == 150
+    for duration in (100, 300, 200, 600):
+        policy.record(duration)
+    # EWMA 400 against a mean of 300: the latest session counts for half
+    assert policy.stats.ewma == pytest.approx(400)
+    assert policy.stats.mean == pytest.approx(300)
+    assert policy.threshold == pytest.approx(200)
@@ -0,0 +1,71 @@
+import random
+import pygame
+from spatial import SpatialHash
+
+
+def make_sprites(rng, group, count):
+    sprites = []
+    for _ in range(count):
+        sprite = pygame.sprite.Sprite(group)
+        sprite.rect = pygame.Rect(rng.randrange(-50, 650), rng.randrange(-50, 850),
+                                  rng.randrange(1, 90), rng.randrange(1, 90))
+        sprites.append(sprite)
+    return sprites
+
+
+def brute_force(probe, sprites):
+    return [sprite for sprite in sprites if sprite.alive() and probe.rect.colliderect(sprite.rect)]
+
+
+def test_collide_matches_brute_force():
+    rng = random.Random(1)
+    group = pygame.sprite.Group()
+    sprites = make_sprites(rng, group, 200)
+    grid = SpatialHash(cell_size=64)
+    grid.sync(group)
+    for probe in make_sprites(rng, pygame.sprite.Group(), 300):
+        assert set(grid.collide(probe)) == set(brute_force(probe, sprites))
+
+
+def test_sync_follows_moves_and_removals():
+    rng = random.Random(2)
+    group = pygame.sprite.Group()
+    sprites = make_sprites(rng, group, 100)
+    grid = SpatialHash(cell_size=48)
+    grid.sync(group)
+    for step in range(20):
+        for sprite in sprites:
+            sprite.rect.move_ip(rng.randrange(-40, 41), rng.randrange(-40, 41))
+        for sprite in rng.sample(group.sprites(), 3):
+            sprite.kill()
+        grid.sync(group)
+        assert set(grid.sprite_cells) == set(group)
+        for probe in make_sprites(rng, pygame.sprite.Group(), 30):
+            assert set(grid.collide(probe)) == set(brute_force(probe, sprites))
+
+
+def test_killed_sprites_are_skipped_before_sync():
+    group = pygame.sprite.Group()
+    target = pygame.sprite.Sprite(group)
+    target.rect = pygame.Rect(10, 10, 20, 20)
+    probe = pygame.sprite.Sprite()
+    probe.rect = pygame.Rect(15, 15, 5, 5)
+    grid = SpatialHash()
+    grid.sync(group)
+    assert grid.collide(probe) == [target]
+    target.kill()
+    assert grid.collide(probe) == []
+
+
+def test_each_candidate_is_tested_once():
+    # A sprite spanning several cells must not be reported (or counted) once per cell
+    group = pygame.sprite.Group()
+    wide = pygame.sprite.Sprite(group)
+    wide.rect = pygame.Rect(0, 0, 200, 200)
+    probe = pygame.sprite.Sprite()
+    probe.rect = pygame.Rect(50, 50, 100, 100)
+    grid = SpatialHash(cell_size=32)
+    grid.sync(group)
+    assert grid.collide(probe) == [wide]
+    assert grid.tests == 1
+    assert grid.linear_tests == 1
@@ -0,0 +1,44 @@
+import json
+from rest_logic import append_stats_record, read_game_stats, migrate_game_stats
+
+
+def test_append_and_read_back_in_order(tmp_path):
+    path = str(tmp_path / "game_data.jsonl")
+    records = [{"session": i, "mode": "normal"} for i in range(5)]
+    for record in records:
+        append_stats_record(record, path)
+    assert list(read_game_stats(path)) == records
+
+
+def test_missing_log_reads_as_empty(tmp_path):
+    assert list(read_game_stats(str(tmp_path / "missing.jsonl"))) == []
+
+
+def test_torn_last_line_is_skipped_and_next_append_starts_a_fresh_line(tmp_path):
+    path = tmp_path / "game_data.jsonl"
+    append_stats_record({"session": 1}, str(path))
+    # A crash part way through an append leaves half a record with no newline
+    with open(path, "ab") as f:
+        f.write(b'{"session": 2, "mo')
+    assert list(read_game_stats(str(path))) == [{"session": 1}]
+
+    append_stats_record({"session": 3}, str(path))
+    assert list(read_game_stats(str(path))) == [{"session": 1}, {"session": 3}]
+    lines = path.read_bytes().split(b"\n")
+    assert lines[1] == b'{"session": 2, "mo'
+    assert json.loads(lines[2]) == {"session": 3}
+
+
+def test_migrate_copies_the_legacy_array_once(tmp_path):
+    old_path = tmp_path / "game_data.json"
+    new_path = str(tmp_path / "game_data.jsonl")
+    records = [{"session": 1}, {"session": 2}]
+    old_path.write_text(json.dumps(records))
+
+    assert migrate_game_stats(str(old_path), new_path) == 2
+    assert list(read_game_stats(new_path)) == records
+    assert old_path.exists()  # Kept as a backup
+
+    append_stats_record({"session": 3}, new_path)
+    assert migrate_game_stats(str(old_path), new_path) == 0
+    assert len(list(read_game_stats(new_path))) == 3
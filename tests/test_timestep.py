@@ -0,0 +1,83 @@
+import pygame
+import pytest
+import headless
+import render as render_module
+from clock import FrameClock, FixedTimestep
+from engine import GameEngine, FrameInput
+from settings import MODE_NORMAL
+
+
+def test_long_frame_runs_at_most_max_ticks_and_drops_the_rest():
+    timestep = FixedTimestep(60, 5)
+    ticks, dropped = timestep.advance(0.5)
+    assert ticks == 5
+    assert dropped == pytest.approx(0.5 - 5 / 60)
+    assert timestep.accumulator == 0.0
+
+    # The next normal frame starts from nothing rather than working off the backlog
+    ticks, dropped = timestep.advance(1 / 60)
+    assert (ticks, dropped) == (1, 0.0)
+
+
+def test_short_frames_carry_their_leftover_time():
+    timestep = FixedTimestep(60, 5)
+    assert timestep.advance(0.01) == (0, 0.0)
+    assert timestep.advance(0.01) == (1, 0.0)
+    assert timestep.accumulator == pytest.approx(0.02 - 1 / 60)
+
+
+def test_alpha_stays_in_the_unit_interval():
+    timestep = FixedTimestep(60, 5)
+    frame_times = [0.001, 1 / 60, 1 / 30, 0.0169, 0.05, 1 / 60 * 3, 0.2, 0.0, 0.007] * 50
+    for seconds in frame_times:
+        timestep.advance(seconds)
+        assert 0.0 <= timestep.alpha < 1.0
+
+
+def test_dropped_time_reaches_time_but_not_ticks():
+    clock = FrameClock(60, start=0)
+    clock.advance()
+    clock.drop(0.25)
+    assert clock.ticks() == 16
+    assert clock.time() == pytest.approx(1 / 60 + 0.25)
+    clock.skip(2)
+    assert clock.ticks() == 2016
+    assert clock.time() == pytest.approx(1 / 60 + 2.25)
+
+
+def played_game(track_positions):
+    clock = FrameClock(start=0)
+    game = GameEngine(persist=False, clock=clock, seed=5)
+    game.track_positions = track_positions
+    game.select_mode(MODE_NORMAL)
+    for frame in range(300):
+        game.step(FrameInput(right=frame % 120 < 60, left=frame % 120 >= 60, fire=True))
+        clock.advance()
+    return game
+
+
+def test_without_interpolation_sprites_are_drawn_at_their_positions():
+    headless.init_headless()
+    screen = pygame.Surface((render_module.screen_width, render_module.screen_height))
+    renderer = render_module.Renderer(screen)
+
+    # --no-interpolation: no positions tracked and every frame drawn at alpha 1
+    game = played_game(track_positions=False)
+    assert not game.previous_positions
+    renderer.draw(game, (0, 0), 1.0)
+    plain = pygame.image.tostring(screen, "RGB")
+    sprites = [sprite for group in game.moving_groups for sprite in group]
+    drawn_at = [renderer.sprite_rect(game, sprite) for sprite in sprites]
+    assert drawn_at == [sprite.rect for sprite in sprites]
+
+    # Interpolating between ticks draws the ship part of the way back from where it is
+    tracked = played_game(track_positions=True)
+    ship = tracked.spaceship
+    previous = tracked.previous_positions[ship]
+    assert previous != ship.rect.topleft
+    renderer.alpha = 0.0
+    assert renderer.sprite_rect(tracked, ship).topleft == previous
+
+    # At alpha 1 the tracked game looks exactly like the untracked one
+    renderer.draw(tracked, (0, 0), 1.0)
+    assert pygame.image.tostring(screen, "RGB") == plain
@@ -0,0 +1,71 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+
+
+# Records timestamped spans in memory and writes them out as a Chrome Trace Event file
+# (load it in Perfetto or chrome://tracing). Events go into a fixed-size ring buffer, so a
+# long session keeps only its most recent events and nothing touches the disk until write().
+class Tracer:
+    def __init__(self, capacity=200000, enabled=True):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        # (phase, name, category, start seconds, duration seconds, thread id, args)
+        self.events = deque(maxlen=capacity)
+        self.recorded = 0
+        self.thread_names = {threading.get_ident(): "main"}
+
+    def complete(self, name, category, started, ended=None, args=None):
+        """Record a span that began at perf_counter() time started."""
+        if not self.enabled:
+            return
+        if ended is None:
+            ended = time.perf_counter()
+        thread = threading.get_ident()
+        self.events.append(("X", name, category, started, ended - started, thread, args))
+        self.recorded += 1
+
+    def instant(self, name, category, args=None):
+        if not self.enabled:
+            return
+        thread = threading.get_ident()
+        self.events.append(("i", name, category, time.perf_counter(), 0.0, thread, args))
+        self.recorded += 1
+
+    def counter(self, name, values):
+        if not self.enabled:
+            return
+        thread = threading.get_ident()
+        self.events.append(("C", name, "counter", time.perf_counter(), 0.0, thread, values))
+        self.recorded += 1
+
+    def name_thread(self, name):
+        """Label the calling thread in the trace viewer."""
+        self.thread_names[threading.get_ident()] = name
+
+    def dropped(self):
+        return self.recorded - len(self.events)
+
+    def trace_events(self):
+        pid = os.getpid()
+        events = [{"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in self.thread_names.items()]
+        for phase, name, category, started, duration, tid, args in list(self.events):
+            event = {"ph": phase, "name": name, "cat": category, "pid": pid, "tid": tid,
+                     "ts": round((started - self.origin) * 1e6, 3)}
+            if phase == "X":
+                event["dur"] = round(duration * 1e6, 3)
+            elif phase == "i":
+                event["s"] = "t"
+            if args:
+                event["args"] = args
+            events.append(event)
+        return events
+
+    def write(self, path):
+        """Write everything still in the buffer to path."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms",
+                       "otherData": {"dropped_events": self.dropped()}}, f)